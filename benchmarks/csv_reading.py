@@ -0,0 +1,86 @@
+"""
+Benchmark of the tabular (csv) reading path: pandas type inference & NA detection (as before),
+against string-typed reading (and the arrow engine, if pyarrow is installed).
+Reports rows/s for reading, and for reading + validating.
+
+Usage: python benchmarks/csv_reading.py [--rows 200000] [--columns 50]
+"""
+from argparse import ArgumentParser
+import os
+import random
+import tempfile
+import time
+
+import pandas
+
+from checkcel import Checkcel, readers
+from checkcel.validators import FloatValidator, SetValidator, TextValidator
+
+
+def write_file(path, rows, columns):
+    random.seed(0)
+    values = {
+        "text": ["value{}".format(i) for i in range(100)],
+        "float": ["{:.2f}".format(random.uniform(0, 100)) for i in range(100)],
+        "set": ["a", "b", "c"],
+    }
+    kinds = [("text", "float", "set")[i % 3] for i in range(columns)]
+    with open(path, "w") as f:
+        f.write(",".join("{}_{}".format(kind, i) for i, kind in enumerate(kinds)) + "\n")
+        for _ in range(rows):
+            f.write(",".join(random.choice(values[kind]) for kind in kinds) + "\n")
+    return kinds
+
+
+def validators(kinds):
+    validators = {}
+    for i, kind in enumerate(kinds):
+        if kind == "text":
+            validators["{}_{}".format(kind, i)] = TextValidator()
+        elif kind == "float":
+            validators["{}_{}".format(kind, i)] = FloatValidator(min=0)
+        else:
+            validators["{}_{}".format(kind, i)] = SetValidator(valid_values=["a", "b", "c"])
+    return validators
+
+
+def timed(function, repeat):
+    """ Best time of repeat runs (single runs are too noisy to compare the readers) """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark csv reading")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "data.csv")
+        kinds = write_file(path, args.rows, args.columns)
+
+        inferred, _ = timed(lambda: pandas.read_csv(path), args.repeat)
+        inferred_total, _ = timed(lambda: Checkcel(data=pandas.read_csv(path), validators=validators(kinds)).validate(), args.repeat)
+        checkcel = Checkcel(source=path, format="tabular", validators=validators(kinds))
+        string, _ = timed(lambda: checkcel._read_csv(), args.repeat)
+        string_total, _ = timed(lambda: Checkcel(source=path, format="tabular", validators=validators(kinds)).validate(), args.repeat)
+        if readers.pyarrow is not None:
+            arrow, _ = timed(lambda: next(readers.read_csv_arrow(path)), args.repeat)
+            arrow_total, _ = timed(lambda: Checkcel(source=path, format="tabular", engine="arrow", validators=validators(kinds)).validate(), args.repeat)
+
+    print("{} rows x {} columns".format(args.rows, args.columns))
+    print("{:<30}{:>15}{:>25}".format("", "read (rows/s)", "read + validate (rows/s)"))
+    print("{:<30}{:>15.0f}{:>25.0f}".format("type inference (before)", args.rows / inferred, args.rows / inferred_total))
+    print("{:<30}{:>15.0f}{:>25.0f}".format("string-typed (after)", args.rows / string, args.rows / string_total))
+    if readers.pyarrow is not None:
+        print("{:<30}{:>15.0f}{:>25.0f}".format("arrow (engine=arrow)", args.rows / arrow, args.rows / arrow_total))
+
+
+if __name__ == "__main__":
+    main()
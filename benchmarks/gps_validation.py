@@ -0,0 +1,65 @@
+"""
+Benchmark of the GPSValidator checks on GPS strings, in DD and DMS formats: the former check (pattern rebuilt
+for each value, re.findall), the compiled pattern value by value, and the column check (Series.str.match).
+Reports values/s of each check (the values are mostly distinct, so each of them is actually checked).
+
+Usage: python benchmarks/gps_validation.py [--rows 1000000]
+"""
+from argparse import ArgumentParser
+import random
+import re
+import time
+
+import pandas
+
+from checkcel.validators import GPSValidator, Validator, _factorize, _gps_regex
+
+
+def dd_values(rows):
+    return ["{:.5f}, {:.5f}".format(random.uniform(-90, 90), random.uniform(-180, 180)) for _ in range(rows)]
+
+
+def dms_values(rows):
+    return [
+        "{}°{}'{:.2f}\"{} {}°{}'{:.2f}\"{}".format(
+            random.randrange(90), random.randrange(60), random.uniform(0, 59), random.choice("NS"),
+            random.randrange(180), random.randrange(60), random.uniform(0, 59), random.choice("EW")
+        )
+        for _ in range(rows)
+    ]
+
+
+def rebuilt_pattern(validator, values):
+    # Former check: the pattern was formatted again for each value
+    return sum(len(re.findall(_gps_regex(validator.format, validator.only_long, validator.only_lat), value)) == 1 for value in values)
+
+
+def measured(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark GPS validation")
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    print("{:<8}{:<30}{:>15}".format("format", "check", "values/s"))
+    for format, values in (("DD", dd_values(args.rows)), ("DMS", dms_values(args.rows))):
+        validator = GPSValidator(format=format, empty_ok=False)
+        codes, distinct_values = _factorize(pandas.Series(values, dtype=object))
+        checks = [
+            ("pattern rebuilt per value", lambda: rebuilt_pattern(validator, distinct_values)),
+            ("compiled pattern per value", lambda: Validator._check_distinct_values(validator, codes, distinct_values, None)),
+            ("column (str.match)", lambda: validator._check_distinct_values(codes, distinct_values, None)),
+        ]
+        for name, check in checks:
+            print("{:<8}{:<30}{:>15.0f}".format(format, name, len(values) / measured(check)))
+        failed = sum(isinstance(verdict, Exception) for verdict in validator._check_distinct_values(codes, distinct_values, None)[0])
+        print("{:<8}{} invalid value(s)".format(format, failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the xlsx reading paths: pandas.read_excel, openpyxl read-only mode (read_xlsx),
+and the xml engine (read_xlsx_xml, parsing the sheet and its shared strings directly).
+Reports rows/s of each reader, and their peak memory with --memory (measured separately: tracemalloc slows reading down).
+
+The default workbook is about 100MB. Pass --source to use an existing xlsx file instead.
+
+Usage: python benchmarks/xlsx_reading.py [--rows 1000000] [--columns 12] [--source file.xlsx] [--chunksize 100000] [--memory]
+"""
+from argparse import ArgumentParser
+import datetime
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from openpyxl import Workbook
+import pandas
+
+from checkcel import readers
+
+
+def write_file(path, rows, columns):
+    random.seed(0)
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    kinds = [("text", "float", "set", "date")[i % 4] for i in range(columns)]
+    worksheet.append(["{}_{}".format(kind, i) for i, kind in enumerate(kinds)])
+    texts = ["value{}".format(i) for i in range(10000)]
+    start = datetime.datetime(2000, 1, 1)
+    for _ in range(rows):
+        row = []
+        for kind in kinds:
+            if kind == "text":
+                row.append(random.choice(texts))
+            elif kind == "float":
+                row.append(random.uniform(0, 100))
+            elif kind == "set":
+                row.append(random.choice(["a", "b", "c"]))
+            else:
+                row.append(start + datetime.timedelta(days=random.randrange(10000)))
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def measured(function, memory=False):
+    start = time.perf_counter()
+    rows = function()
+    duration = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return rows, duration, peak
+
+
+def read_pandas(path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return len(pandas.read_excel(path, dtype=str, keep_default_na=False).index)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark xlsx reading")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--columns", type=int, default=12)
+    parser.add_argument("--source", default=None)
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.source
+        if path is None:
+            path = os.path.join(directory, "data.xlsx")
+            write_file(path, args.rows, args.columns)
+
+        results = [
+            ("pandas.read_excel", measured(lambda: read_pandas(path), args.memory)),
+            ("openpyxl read-only", measured(lambda: sum(len(df.index) for df in readers.read_xlsx(path, chunksize=args.chunksize)), args.memory)),
+            ("xml engine", measured(lambda: sum(len(df.index) for df in readers.read_xlsx_xml(path, chunksize=args.chunksize)), args.memory)),
+        ]
+        size = os.path.getsize(path)
+
+    print("{} ({:.1f}MB), chunks of {} rows for the streaming readers".format(path if args.source else "generated workbook", size / 1e6, args.chunksize))
+    print("{:<25}{:>10}{:>15}{:>20}".format("", "rows", "rows/s", "peak memory (MB)"))
+    for name, (rows, duration, peak) in results:
+        print("{:<25}{:>10}{:>15.0f}{:>20}".format(name, rows, rows / duration, "{:.1f}".format(peak / 1e6) if peak else "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 from __future__ import division
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import numpy
 import pandas
 import warnings
 
-from checkcel.exceptions import ValidationException
 from checkcel.checkplate import Checkplate
+from checkcel.failures import FailureStore
+from checkcel import readers
+from checkcel.readers import read_csv_arrow, read_excel_typed, read_ods, read_ods_header, read_xlsx, read_xlsx_header, read_xlsx_xml, read_xlsx_xml_header
+from checkcel.validators import CastValidator, DateValidator, LinkedSetValidator, NoValidator, SetValidator, TimeValidator
 
 
 class Checkcel(Checkplate):
@@ -17,10 +22,19 @@ class Checkcel(Checkplate):
         sheet=0,
         row=0,
         ignore_missing_validators=False,
+        chunksize=None,
+        jobs=1,
+        parallel="columns",
+        max_failures=None,
+        max_failures_per_column=None,
+        only_template_columns=False,
+        engine="pandas",
+        categorical=False,
+        native_types=False,
         **kwargs
     ):
         super(Checkcel, self).__init__(**kwargs)
-        self.failures = defaultdict(lambda: defaultdict(list))
+        self.failures = FailureStore()
         self.missing_validators = None
         self.missing_fields = None
         self.source = source
@@ -33,6 +47,28 @@ class Checkcel(Checkplate):
         self.line_count = row + 1
         self.column_set = set()
         self.ignore_missing_validators = ignore_missing_validators
+        # Number of rows read (and validated) at once. None to load the whole file
+        self.chunksize = int(chunksize) if chunksize else None
+        # Number of processes validating (groups of) columns in parallel
+        self.jobs = int(jobs) if jobs else 1
+        # Split the work between processes by groups of columns, or by shards of rows
+        self.parallel = parallel
+        # Validation stops once these numbers of failures are reached
+        self.max_failures = int(max_failures) if max_failures else None
+        self.max_failures_per_column = int(max_failures_per_column) if max_failures_per_column else None
+        # Whether a failure limit was reached: other failures may be missing from the report
+        self.truncated = False
+        # Only read the columns the template validates (and the columns they depend on)
+        self.only_template_columns = only_template_columns
+        # Columns to read from the source file (None for all columns)
+        self.usecols = None
+        # Reader: pandas, pyarrow for tabular files (multi-threaded, with Arrow string columns),
+        # or xml for xlsx files (parsing the sheet directly, instead of going through openpyxl)
+        self.engine = engine
+        # Read the set columns of the source file as categoricals (less memory, categories checked once)
+        self.categorical = categorical
+        # Keep the numbers, dates and times of spreadsheets as such (instead of strings) for the validators of these types
+        self.native_types = native_types
 
         if not (self.source or self.data is not None):
             raise Exception("Need to provide either a source or the data (as a pandas dataframe)")
@@ -40,6 +76,12 @@ class Checkcel(Checkplate):
         if format not in ["spreadsheet", "tabular"]:
             raise Exception("Type must be either spreadsheet or tabular")
 
+        if parallel not in ["columns", "rows"]:
+            raise Exception("Parallel must be either columns or rows")
+
+        if engine not in ["pandas", "arrow", "xml"]:
+            raise Exception("Engine must be either pandas, arrow or xml")
+
     def _log_debug_failures(self):
         for field_name, field_failure in self.failures.items():
             self.debug('\nFailure on field: "{}":'.format(field_name))
@@ -88,6 +130,16 @@ class Checkcel(Checkplate):
                     except TypeError as e:
                         raise e
 
+    def _log_truncation(self):
+        if not self.truncated:
+            return
+        if self.max_failures and self._fail_count() >= self.max_failures:
+            self.error("  Validation stopped after {} failure(s): the report is truncated".format(self.max_failures))
+        if self.max_failures_per_column:
+            for field_name, validator in self.validators.items():
+                if validator.fail_count >= self.max_failures_per_column:
+                    self.error("  Failures on field '{}' capped at {}: the report is truncated".format(field_name, self.max_failures_per_column))
+
     def _log_missing_validators(self):
         self.error("  Missing validators for:")
         self._log_missing(self.missing_validators)
@@ -109,29 +161,83 @@ class Checkcel(Checkplate):
         self.info("\nValidating {}{}".format(self.__class__.__name__, "(source={})".format(self.source) if self.source else ""))
 
         if self.source:
-            if self.format == "spreadsheet":
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    df = pandas.read_excel(self.source, sheet_name=self.sheet, keep_default_na=False, skiprows=self.row, dtype=str)
-            else:
-                df = pandas.read_csv(self.source, sep=self.delimiter, skiprows=self.row)
-
-            if len(df) == 0:
+            # Wrong headers are rejected before loading the whole file
+            columns = self._read_header()
+            if columns and not self._check_columns(columns):
+                return False
+            if columns and self.only_template_columns:
+                template_columns = self._template_columns()
+                self.usecols = [column for column in columns if column in template_columns]
+
+            batches = self._read_source(columns)
+            df = next(batches, None)
+            # Columns of the header may be missing from the loaded file (when they are not named the same way)
+            if df is not None and self.usecols is not None and not self._check_projection(df.columns):
+                return False
+            if df is None or len(df) == 0:
                 self.info(
                     "\033[1;33m", "Source file has no data", "\033[0m"
                 )
                 return False
 
         else:
+            batches = iter([])
             df = self.data
 
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+        df = self._drop_unnamed(df)
+
+        # With a projection, the header was already checked, and the other columns were not read
+        if self.usecols is None and not self._check_columns(df.columns):
+            return False
+
+        # When streaming, the first batch is only a part of the file: rows are counted while validating
+        streaming = bool(self.chunksize and self.source)
+        if self.expected_rows and not streaming and not self.expected_rows == len(df.index):
+            self.error("Length issue: Expecting {} row(s), found {}".format(self.expected_rows, len(df.index)))
+            return False
+
+        row_count = len(df.index)
+        executor = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        try:
+            self._validate(df, executor)
+            for df in batches:
+                row_count += len(df.index)
+                if self._limits_reached():
+                    # The rows left are not checked
+                    self.truncated = self.truncated or len(df.index) > 0
+                    if not self.expected_rows:
+                        break
+                    # The remaining rows are only counted
+                    continue
+                self._validate(self._drop_unnamed(df), executor)
+        finally:
+            if executor:
+                executor.shutdown()
+            # Remove the values spilled to disk by the unicity checks
+            for validator in self.validators.values():
+                validator.unique_values.close()
+
+        if self.expected_rows and streaming and not self.expected_rows == row_count:
+            self.error("Length issue: Expecting {} row(s), found {}".format(self.expected_rows, row_count))
+            return False
+
+        if self.failures:
+            self.info("\033[0;31m", "Failed", "\033[0m")
+            self._log_debug_failures()
+            self._log_validator_failures()
+            self._log_truncation()
+            return False
+        else:
+            self.info("\033[0;32m", "Passed", "\033[0m")
+            return True
 
-        self.column_set = set(df.columns)
+    def _check_columns(self, columns):
+        """ Check the columns of the file against the validators """
+        self.column_set = set(column for column in columns if not str(column).startswith("Unnamed"))
         validator_set = set(self.validators)
         self.missing_validators = self.column_set - validator_set
         if self.missing_validators:
-            if not self.ignore_missing_validators:
+            if not (self.ignore_missing_validators or self.only_template_columns):
                 self.info("\033[1;33m", "Missing...", "\033[0m")
                 self._log_missing_validators()
                 return False
@@ -141,31 +247,266 @@ class Checkcel(Checkplate):
             self.info("\033[1;33m", "Missing...", "\033[0m")
             self._log_missing_fields()
             return False
+        return True
 
-        if self.expected_rows:
-            if not self.expected_rows == len(df.index):
-                self.error("Length issue: Expecting {} row(s), found {}".format(self.expected_rows, len(df.index)))
-                return False
+    def _check_projection(self, columns):
+        """ Check that the columns to read (from the header) were all loaded """
+        missing_fields = set(self.usecols) - set(columns)
+        if missing_fields:
+            self.missing_fields = missing_fields
+            self.info("\033[1;33m", "Missing...", "\033[0m")
+            self._log_missing_fields()
+            return False
+        return True
 
-        # Might be a way to do it more efficiently..
-        df.apply(lambda row: self._validate(row), axis=1)
+    def _pandas_usecols(self):
+        """ usecols for the pandas readers: a callable, so that columns missing from the file are reported instead of raising """
+        if self.usecols is None:
+            return None
+        usecols = set(self.usecols)
+        return lambda column: column in usecols
 
-        if self.failures:
-            self.info("\033[0;31m", "Failed", "\033[0m")
-            self._log_debug_failures()
-            self._log_validator_failures()
-            return False
+    def _template_columns(self):
+        """ Columns to validate, and the columns they depend on """
+        columns = set()
+        for column, validator in self.validators.items():
+            if isinstance(validator, NoValidator) or validator.skip_validation:
+                continue
+            columns.add(column)
+            columns.update(validator.context_columns)
+        return columns
+
+    def _read_header(self):
+        """ Read only the column names of the source file """
+        if self.format == "spreadsheet" and self._is_xlsx() and self.engine == "xml":
+            return read_xlsx_xml_header(self.source, sheet=self.sheet, row=self.row)
+        elif self.format == "spreadsheet" and self._is_xlsx():
+            return read_xlsx_header(self.source, sheet=self.sheet, row=self.row)
+        elif self.format == "spreadsheet" and self._is_ods():
+            return read_ods_header(self.source, sheet=self.sheet, row=self.row)
+        elif self.format == "spreadsheet":
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return list(pandas.read_excel(self.source, sheet_name=self.sheet, skiprows=self.row, nrows=0).columns)
+        return list(self._read_csv(nrows=0).columns)
+
+    def _read_source(self, columns=None):
+        """ Yield the source file as dataframes: a single one, or one per chunk of rows if chunksize is set """
+        typed_columns = self._typed_columns()
+        if self.format == "spreadsheet" and self._is_xlsx() and self.engine == "xml":
+            yield from read_xlsx_xml(self.source, sheet=self.sheet, row=self.row, chunksize=self.chunksize, usecols=self.usecols, typed_columns=typed_columns)
+        elif self.format == "spreadsheet" and self.chunksize and self._is_xlsx():
+            yield from read_xlsx(self.source, sheet=self.sheet, row=self.row, chunksize=self.chunksize, usecols=self.usecols, typed_columns=typed_columns)
+        elif self.format == "spreadsheet" and self._is_ods():
+            # Streamed from content.xml: pandas' odf engine loads the whole document
+            yield from read_ods(self.source, sheet=self.sheet, row=self.row, chunksize=self.chunksize, usecols=self.usecols, typed_columns=typed_columns)
+        elif self.format == "spreadsheet" and typed_columns:
+            yield read_excel_typed(self.source, sheet=self.sheet, row=self.row, usecols=self._pandas_usecols(), typed_columns=typed_columns)
+        elif self.format == "spreadsheet":
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                df = pandas.read_excel(self.source, sheet_name=self.sheet, keep_default_na=False, skiprows=self.row, dtype=str, usecols=self._pandas_usecols())
+            yield df
+        elif self._use_arrow():
+            yield from read_csv_arrow(self.source, delimiter=self.delimiter, row=self.row, chunksize=self.chunksize, usecols=self.usecols)
+        elif self.chunksize:
+            with self._read_csv(chunksize=self.chunksize, usecols=self._pandas_usecols(), dtype=self._dtypes(columns)) as reader:
+                yield from reader
         else:
-            self.info("\033[0;32m", "Passed", "\033[0m")
+            yield self._read_csv(usecols=self._pandas_usecols(), dtype=self._dtypes(columns))
+
+    def _use_arrow(self):
+        if self.engine != "arrow":
+            return False
+        if readers.pyarrow is None:
+            self.warn("pyarrow is not installed: using the pandas reader")
+            return False
+        # The pyarrow reader only handles single character delimiters
+        return len(self.delimiter) == 1
+
+    def _read_csv(self, dtype=object, **kwargs):
+        # Values are read as strings, without type inference nor NA detection (as for spreadsheets).
+        # Plain object columns: python-backed string columns are slower to factorize
+        return pandas.read_csv(
+            self.source, sep=self.delimiter, skiprows=self.row, dtype=dtype, keep_default_na=False, na_filter=False,
+            engine="c" if len(self.delimiter) == 1 else "python", **kwargs
+        )
+
+    def _typed_columns(self):
+        """ Columns read with their native types (numbers, dates and times of spreadsheets) """
+        if not (self.native_types and self.format == "spreadsheet"):
+            return set()
+        return set(column for column, validator in self.validators.items() if isinstance(validator, (CastValidator, DateValidator, TimeValidator)))
+
+    def _dtypes(self, columns):
+        """ dtype of each column of the header for the csv reader: categoricals for the set columns of the template """
+        set_columns = set(column for column, validator in self.validators.items() if isinstance(validator, (SetValidator, LinkedSetValidator)))
+        if not (self.categorical and columns and set_columns.intersection(columns)):
+            return object
+        # Every column is listed: the columns missing from the mapping would be inferred
+        return {column: "category" if column in set_columns else object for column in columns}
+
+    def _is_xlsx(self):
+        return isinstance(self.source, str) and self.source.lower().endswith((".xlsx", ".xlsm"))
+
+    def _is_ods(self):
+        return isinstance(self.source, str) and self.source.lower().endswith(".ods")
+
+    def _drop_unnamed(self, df):
+        unnamed = df.columns.astype(str).str.startswith('Unnamed')
+        # Only copy the dataframe if there is something to drop
+        return df.loc[:, ~unnamed] if unnamed.any() else df
+
+    def _column_groups(self, columns, df):
+        """ Group together the columns whose validators read each other (linked_column, unique_with, empty_ok_if...) """
+        parents = {}
+
+        def find(column):
+            while parents.setdefault(column, column) != column:
+                column = parents[column]
+            return column
+
+        for column in columns:
+            for linked in self.validators[column].context_columns:
+                if linked in df:
+                    parents[find(linked)] = find(column)
+
+        groups = defaultdict(list)
+        for column in columns:
+            groups[find(column)].append(column)
+        return list(groups.values())
+
+    def _fail_count(self):
+        return sum(validator.fail_count for validator in self.validators.values())
+
+    def _failure_limit(self, column):
+        """ Number of failures still allowed for the column (None if unlimited) """
+        limits = []
+        if self.max_failures:
+            limits.append(self.max_failures - self._fail_count())
+        if self.max_failures_per_column:
+            limits.append(self.max_failures_per_column - self.validators[column].fail_count)
+        return max(min(limits), 0) if limits else None
+
+    def _within_limit(self, validator, shard, failure_count, limit):
+        """ Whether the failures of the shard, and its duplicates of the values already seen, are within limit """
+        if failure_count > limit:
+            return False
+        if failure_count + len(shard.unique_values) <= limit or not validator._checks_unique():
             return True
+        values = [value for value, row_number in shard.unique_values.items()]
+        return failure_count + int(validator.unique_values.seen(values).sum()) <= limit
+
+    def _is_free(self, column):
+        """ Whether the column is not checked by its validator """
+        validator = self.validators[column]
+        return isinstance(validator, NoValidator) or validator.skip_validation
+
+    def _limits_reached(self):
+        if self.max_failures and self._fail_count() >= self.max_failures:
+            return True
+        if self.max_failures_per_column:
+            # Columns which are not checked never fail
+            checked = [validator for column, validator in self.validators.items() if not self._is_free(column)]
+            return bool(checked) and all(validator.fail_count >= self.max_failures_per_column for validator in checked)
+        return False
+
+    def _validate(self, df, executor=None):
+        checked_columns = [column for column in df.columns if column in self.validators and not self._is_free(column)]
+        columns = [column for column in df.columns if column in self.validators and self._failure_limit(column) != 0]
+        if len(df.index) and any(self._failure_limit(column) == 0 for column in checked_columns):
+            # Columns left unchecked once their limit was reached
+            self.truncated = True
+        limits = {column: self._failure_limit(column) for column in columns}
+        if executor and self.parallel == "rows":
+            shards = self._validate_shards(df, columns, limits, executor)
+        elif executor:
+            shards = self._validate_groups(df, columns, limits, executor)
+        else:
+            # Validated one column at a time, for the global limit to stop validation as soon as it is reached
+            shards = None
+
+        for column in columns:
+            limit = self._failure_limit(column)
+            result = self._merge_shards(column, shards[column], len(df.index), limit) if shards is not None else None
+            if result is None:
+                if limit == 0:
+                    self.truncated = self.truncated or not self._is_free(column)
+                    continue
+                # Without shards, or with more failures than allowed: validated here, to stop at the same row as without jobs
+                result = self.validators[column].validate_column(df[column], self.line_count, df, limit)
+            mask, errors, truncated = result
+            if errors:
+                self.failures.add(column, numpy.flatnonzero(mask) + self.line_count, errors)
+            self.validators[column].fail_count += len(errors)
+            self.truncated = self.truncated or truncated
+        self.line_count += len(df.index)
+
+    def _validate_groups(self, df, columns, limits, executor):
+        """
+        Validate groups of columns in parallel. The validators are sent as shards, without the values seen by
+        their unicity checks: only the values of this part of the file come back, to be merged in this process
+        """
+        tasks = []
+        for group in self._column_groups(columns, df):
+            validators = {column: self.validators[column]._shard() for column in group}
+            needed = set(group).union(*[validator.context_columns for validator in validators.values()])
+            tasks.append(executor.submit(_validate_columns, validators, df[[col for col in df.columns if col in needed]], self.line_count, limits))
+        shards = {}
+        for task in tasks:
+            validators, results = task.result()
+            for column, result in results.items():
+                shards[column] = [(0, validators[column], result)]
+        return shards
+
+    def _validate_shards(self, df, columns, limits, executor):
+        """ Validate shards of rows in parallel """
+        shard_size = -(-len(df.index) // self.jobs)
+        starts = range(0, len(df.index), shard_size or 1)
+        tasks = []
+        for start in starts:
+            validators = {column: self.validators[column]._shard() for column in columns}
+            tasks.append(executor.submit(_validate_columns, validators, df.iloc[start:start + shard_size], self.line_count + start, limits))
+        shards = [task.result() for task in tasks]
+        return {column: [(start, validators[column], results[column]) for start, (validators, results) in zip(starts, shards)] for column in columns}
+
+    def _merge_shards(self, column, shards, size, limit):
+        """
+        Merge the shards (start row, validator, result) of a column into its validator.
+        Return the failure mask, the errors and whether some were left out, as validate_column.
+        Return None, without changing the validator, if the shards hold more than limit failures
+        """
+        validator = self.validators[column]
+        mask = numpy.zeros(size, dtype=bool)
+        row_errors = numpy.empty(size, dtype=object)
+        truncated = False
+        merged = None
+        for start, shard, (shard_mask, shard_errors, shard_truncated) in shards:
+            failing = numpy.flatnonzero(shard_mask) + start
+            mask[failing] = True
+            row_errors[failing] = shard_errors
+            truncated = truncated or shard_truncated
+            if merged is None:
+                merged = shard
+                continue
+            # Values seen for the first time in the shard may be duplicates of previous shards
+            for row_number, error in merged._merge(shard):
+                mask[row_number - self.line_count] = True
+                row_errors[row_number - self.line_count] = error
+        if limit is not None and not self._within_limit(validator, merged, mask.sum(), limit):
+            merged.unique_values.close()
+            return None
+
+        # ... or of the previous rows
+        for row_number, error in validator._merge(merged):
+            mask[row_number - self.line_count] = True
+            row_errors[row_number - self.line_count] = error
+        return mask, row_errors[mask].tolist(), truncated
+
 
-    def _validate(self, row):
-        for column in self.column_set:
-            if column in self.validators:
-                validator = self.validators[column]
-                try:
-                    validator.validate(row[column], self.line_count, row)
-                except ValidationException as e:
-                    self.failures[column][self.line_count].append(e)
-                    validator.fail_count += 1
-        self.line_count += 1
+def _validate_columns(validators, df, first_row, limits):
+    # Column-major: each validator gets its whole column at once
+    results = {}
+    for column, validator in validators.items():
+        results[column] = validator.validate_column(df[column], first_row, df, limits[column])
+    return validators, results
@@ -1,6 +1,7 @@
 from checkcel import logs
 from checkcel import exits
 from checkcel import validators
+from checkcel.unicity import UNIQUE_MEMORY_LIMIT
 
 import inspect
 import json
@@ -15,7 +16,7 @@ from copy import deepcopy
 
 class Checkplate(object):
     """ Base class for templates """
-    def __init__(self, validators={}, empty_ok=False, ignore_case=False, ignore_space=False, metadata=[], expected_rows=None, na_ok=False, unique=False, skip_generation=False, skip_validation=False, freeze_header=False):
+    def __init__(self, validators={}, empty_ok=False, ignore_case=False, ignore_space=False, metadata=[], expected_rows=None, na_ok=False, unique=False, skip_generation=False, skip_validation=False, freeze_header=False, unique_backend="memory", unique_memory_limit=UNIQUE_MEMORY_LIMIT):
         self.metadata = metadata
         self.logger = logs.logger
         self.validators = validators or getattr(self, "validators", {})
@@ -24,6 +25,8 @@ class Checkplate(object):
         self.empty_ok = empty_ok
         self.na_ok = na_ok
         self.unique = unique
+        self.unique_backend = unique_backend
+        self.unique_memory_limit = unique_memory_limit
         self.skip_generation = skip_generation
         self.skip_validation = skip_validation
         self.ignore_case = ignore_case
@@ -32,7 +35,7 @@ class Checkplate(object):
         self.freeze_header = freeze_header
         # self.trim_values = False
         for validator in self.validators.values():
-            validator._set_attributes(self.empty_ok, self.ignore_case, self.ignore_space, self.na_ok, self.unique, self.skip_generation, self.skip_validation)
+            validator._set_attributes(self.empty_ok, self.ignore_case, self.ignore_space, self.na_ok, self.unique, self.skip_generation, self.skip_validation, self.unique_backend, self.unique_memory_limit)
 
     def debug(self, message, prefix="", suffix=""):
         self.logger.debug("{}{}{}".format(prefix, message, suffix))
@@ -43,7 +46,7 @@ class Checkplate(object):
         self.logs.append("Info: {}".format(message))
 
     def warn(self, message, prefix="", suffix=""):
-        self.logger.warn("{}{}{}".format(prefix, message, suffix))
+        self.logger.warning("{}{}{}".format(prefix, message, suffix))
         self.logs.append("Warning: {}".format(message))
 
     def error(self, message, prefix="", suffix=""):
@@ -76,6 +79,8 @@ class Checkplate(object):
         self.empty_ok = getattr(custom_class, 'empty_ok', False)
         self.na_ok = getattr(custom_class, 'na_ok', False)
         self.unique = getattr(custom_class, 'unique', False)
+        self.unique_backend = getattr(custom_class, 'unique_backend', "memory")
+        self.unique_memory_limit = getattr(custom_class, 'unique_memory_limit', UNIQUE_MEMORY_LIMIT)
         self.skip_generation = getattr(custom_class, 'skip_generation', False)
         self.skip_validation = getattr(custom_class, 'skip_validation', False)
         self.ignore_case = getattr(custom_class, 'ignore_case', False)
@@ -91,7 +96,7 @@ class Checkplate(object):
             )
 
         for key, validator in self.validators.items():
-            validator._set_attributes(self.empty_ok, self.ignore_case, self.ignore_space, self.na_ok, self.unique, self.skip_generation, self.skip_validation)
+            validator._set_attributes(self.empty_ok, self.ignore_case, self.ignore_space, self.na_ok, self.unique, self.skip_generation, self.skip_validation, self.unique_backend, self.unique_memory_limit)
         return self
 
     def load_from_json_file(self, file_path):
@@ -152,6 +157,8 @@ class Checkplate(object):
         self.ignore_space = data.get('ignore_space', False)
         self.expected_rows = data.get('expected_rows', 0)
         self.unique = data.get('unique', False)
+        self.unique_backend = data.get('unique_backend', "memory")
+        self.unique_memory_limit = data.get('unique_memory_limit', UNIQUE_MEMORY_LIMIT)
         self.skip_generation = data.get('skip_generation', False)
         self.skip_validation = data.get('skip_validation', False)
         self.freeze_header = data.get('freeze_header', False)
@@ -179,7 +186,7 @@ class Checkplate(object):
             try:
                 validator_class = getattr(validators, validator['type'])
                 val = validator_class(**options)
-                val._set_attributes(self.empty_ok, self.ignore_case, self.ignore_space, self.na_ok, self.unique, self.skip_generation, self.skip_validation)
+                val._set_attributes(self.empty_ok, self.ignore_case, self.ignore_space, self.na_ok, self.unique, self.skip_generation, self.skip_validation, self.unique_backend, self.unique_memory_limit)
             except AttributeError:
                 self.error(
                     "{} is not a valid Checkcel Validator".format(validator['type'])
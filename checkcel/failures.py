@@ -0,0 +1,181 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+
+from checkcel.exceptions import ValidationException
+
+# Failure codes reported by the validators
+EMPTY = 0
+INVALID = 1
+NOT_A_NUMBER = 2
+NOT_AN_INTEGER = 3
+BELOW_MIN = 4
+ABOVE_MAX = 5
+LINKED_EMPTY = 6
+LINKED_INVALID = 7
+NOT_ALLOWED = 8
+NOT_BEFORE = 9
+NOT_AFTER = 10
+NOT_ONTOLOGICAL = 11
+NO_REGEX_MATCH = 12
+NOT_GPS = 13
+DUPLICATE = 14
+DUPLICATE_WITH = 15
+# Message of the underlying library (dateutil, email_validator)
+LIBRARY_ERROR = 16
+
+MESSAGES = {
+    EMPTY: "Field cannot be empty",
+    INVALID: "'{}' is invalid",
+    NOT_A_NUMBER: "could not convert string to float: {!r}",
+    NOT_AN_INTEGER: "{} is not an integer",
+    BELOW_MIN: "{} is below min value {}",
+    ABOVE_MAX: "{} is above max value {}",
+    LINKED_EMPTY: "Linked column {} is empty",
+    LINKED_INVALID: "Linked column {} value {} is not in valid values",
+    NOT_ALLOWED: "Value {} is not in allowed values",
+    NOT_BEFORE: "Value {} is not before {}",
+    NOT_AFTER: "Value {} is not after {}",
+    NOT_ONTOLOGICAL: "{} is not an ontological term",
+    NO_REGEX_MATCH: "{} does not match regex {}",
+    NOT_GPS: "{} is not a valid GPS coordinate",
+    DUPLICATE: "'{}' is already in the column",
+    DUPLICATE_WITH: "'{}' is already in the column (unique with: {})",
+    LIBRARY_ERROR: "{}",
+}
+
+
+class ValidationFailure(ValidationException):
+    """ A failed check, returned (not raised) by the validators. The message is only built when needed """
+
+    def __init__(self, code, *values):
+        super(ValidationFailure, self).__init__(code, *values)
+        self.code = code
+        self.values = values
+
+    def __str__(self):
+        return MESSAGES[self.code].format(*self.values)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, str(self))
+
+
+class RowSet(object):
+    """ Compact (array-backed) set of row numbers, sorted when read """
+
+    def __init__(self, rows=()):
+        self._rows = array("q")
+        self._sorted = True
+        self.update(rows)
+
+    def add(self, row):
+        if self._rows and row <= self._rows[-1]:
+            self._sorted = False
+        self._rows.append(row)
+
+    def update(self, rows):
+        self._rows.extend(rows)
+        self._sorted = False
+
+    def _normalize(self):
+        if not self._sorted:
+            self._rows = array("q", sorted(set(self._rows)))
+            self._sorted = True
+
+    def __iter__(self):
+        self._normalize()
+        return iter(self._rows)
+
+    def __len__(self):
+        self._normalize()
+        return len(self._rows)
+
+    def __contains__(self, row):
+        self._normalize()
+        index = bisect_left(self._rows, row)
+        return index < len(self._rows) and self._rows[index] == row
+
+    def __eq__(self, other):
+        return set(self) == set(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, list(self))
+
+
+class FailureColumn(Mapping):
+    """
+    Failures of a column: row numbers, failure codes and indexes in a table of the distinct failure values.
+    Read as a {row_number: [ValidationFailure]} mapping. Rows must be added in increasing order
+    """
+
+    def __init__(self):
+        self._rows = array("q")
+        self._codes = array("B")
+        self._value_indexes = array("L")
+        self._values = []
+        self._interned = {}
+        self._row_count = 0
+
+    def add(self, row, failure):
+        if not isinstance(failure, ValidationFailure):
+            failure = ValidationFailure(LIBRARY_ERROR, failure)
+        try:
+            index = self._interned.setdefault(failure.values, len(self._values))
+        except TypeError:
+            # Unhashable value: not interned
+            index = len(self._values)
+        if index == len(self._values):
+            self._values.append(failure.values)
+        if not self._rows or self._rows[-1] != row:
+            self._row_count += 1
+        self._rows.append(row)
+        self._codes.append(failure.code)
+        self._value_indexes.append(index)
+
+    def _failure(self, position):
+        return ValidationFailure(self._codes[position], *self._values[self._value_indexes[position]])
+
+    def __getitem__(self, row):
+        start = bisect_left(self._rows, row)
+        end = bisect_right(self._rows, row)
+        if start == end:
+            raise KeyError(row)
+        return [self._failure(position) for position in range(start, end)]
+
+    def __iter__(self):
+        previous = None
+        for row in self._rows:
+            if row != previous:
+                yield row
+                previous = row
+
+    def __len__(self):
+        return self._row_count
+
+
+class FailureStore(Mapping):
+    """ Failures of a validation, stored column by column. Read as a {column: {row_number: [ValidationFailure]}} mapping """
+
+    def __init__(self):
+        self._columns = {}
+
+    def add(self, column, rows, failures):
+        if column not in self._columns:
+            self._columns[column] = FailureColumn()
+        for row, failure in zip(rows, failures):
+            self._columns[column].add(int(row), failure)
+
+    def __getitem__(self, column):
+        # Columns without failures are empty
+        return self._columns.get(column, FailureColumn())
+
+    def __contains__(self, column):
+        return column in self._columns
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
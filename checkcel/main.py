@@ -73,6 +73,76 @@ def parse_args():
         default="python"
     )
 
+    parser_validate.add_argument(
+        "--chunksize",
+        dest="chunksize",
+        type=int,
+        default=None,
+        help="Validate the file n rows at a time, to limit memory usage (default: load the whole file)",
+    )
+
+    parser_validate.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to validate the file in parallel (default 1)",
+    )
+
+    parser_validate.add_argument(
+        "--parallel",
+        dest="parallel",
+        choices=['columns', 'rows'],
+        help="With --jobs, split the work by groups of columns or by shards of rows (default columns)",
+        default="columns"
+    )
+
+    parser_validate.add_argument(
+        "--max-failures",
+        dest="max_failures",
+        type=int,
+        default=None,
+        help="Stop the validation after n failures (the report is truncated)",
+    )
+
+    parser_validate.add_argument(
+        "--max-failures-per-column",
+        dest="max_failures_per_column",
+        type=int,
+        default=None,
+        help="Stop validating a column after n failures (the report is truncated)",
+    )
+
+    parser_validate.add_argument(
+        "--only-template-columns",
+        dest="only_template_columns",
+        action="store_true",
+        help="Only read the columns validated by the template, and ignore the others",
+    )
+
+    parser_validate.add_argument(
+        "--engine",
+        dest="engine",
+        choices=['pandas', 'arrow', 'xml'],
+        help="Reader (default pandas): arrow for tabular files (requires pyarrow), xml for xlsx files",
+        default="pandas"
+    )
+
+    parser_validate.add_argument(
+        "--categorical",
+        dest="categorical",
+        action="store_true",
+        help="Read the set columns of csv files as categoricals",
+    )
+
+    parser_validate.add_argument(
+        "--native-types",
+        dest="native_types",
+        action="store_true",
+        help="Keep the numbers, dates and times of spreadsheets as such for number, date and time validators (no string round-trip)",
+    )
+
     parser_generate = subparsers.add_parser('generate', help='Generate an xlsx file')
 
     parser_generate.add_argument(
@@ -155,7 +225,16 @@ def main():
             format=arguments.format,
             delimiter=arguments.delimiter,
             sheet=arguments.sheet,
-            row=arguments.row
+            row=arguments.row,
+            chunksize=arguments.chunksize,
+            jobs=arguments.jobs,
+            parallel=arguments.parallel,
+            max_failures=arguments.max_failures,
+            max_failures_per_column=arguments.max_failures_per_column,
+            only_template_columns=arguments.only_template_columns,
+            engine=arguments.engine,
+            categorical=arguments.categorical,
+            native_types=arguments.native_types
         )
 
         if arguments.template_type == "python":
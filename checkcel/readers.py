@@ -0,0 +1,547 @@
+from openpyxl import load_workbook
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+from xml.etree.ElementTree import fromstring, iterparse
+
+from array import array
+import datetime
+import io
+import posixpath
+import re
+import warnings
+import zipfile
+
+import pandas
+
+try:
+    import pyarrow
+    from pyarrow import csv as pyarrow_csv
+except ImportError:
+    pyarrow = None
+
+
+def _convert_xlsx_value(value):
+    # Same conversion as pandas.read_excel(dtype=str, keep_default_na=False)
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _convert_typed_value(value):
+    # Native numbers, dates and times are kept. Booleans are read as strings, as they would hash like 0 and 1
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _format_header(values):
+    # Same column naming as pandas: 'Unnamed: n' for empty cells, and 'name.n' for duplicates
+    header = []
+    seen = {}
+    for index, value in enumerate(values):
+        if value is None or value == "":
+            name = "Unnamed: {}".format(index)
+        elif isinstance(value, float) and value.is_integer():
+            name = int(value)
+        else:
+            name = value
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = "{}.{}".format(base, seen[base])
+        seen[name] = 0
+        header.append(name)
+    return header
+
+
+def _trim_row(values):
+    values = list(values)
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def _read_header(rows):
+    # The header is the first row, as with pandas: an empty first row only gives unnamed columns
+    for values in rows:
+        return _format_header(_trim_row(values))
+    return None
+
+
+def read_xlsx_header(source, sheet=0, row=0):
+    """ Read only the column names of an xlsx file (an empty list if the sheet is empty) """
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook.worksheets[sheet]
+        worksheet.reset_dimensions()
+        return _read_header(worksheet.iter_rows(min_row=row + 1, values_only=True)) or []
+    finally:
+        workbook.close()
+
+
+def read_xlsx(source, sheet=0, row=0, chunksize=10000, usecols=None, typed_columns=()):
+    """
+    Stream an xlsx file as dataframes of (at most) chunksize rows, using openpyxl read-only mode.
+    Values are read as strings, as with pandas.read_excel(dtype=str, keep_default_na=False),
+    except in typed_columns, where numbers, dates and times are kept as such.
+    If usecols is set, only these columns are kept
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook.worksheets[sheet]
+        # Dimensions stored in the file are not always reliable
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(min_row=row + 1, values_only=True)
+        yield from _read_batches(rows, chunksize, usecols, _convert_xlsx_value, typed_columns)
+    finally:
+        workbook.close()
+
+
+def read_ods_header(source, sheet=0, row=0):
+    """ Read only the column names of an ods file (an empty list if the sheet is empty) """
+    return _read_header(_iter_ods_rows(source, sheet=sheet, row=row)) or []
+
+
+def read_ods(source, sheet=0, row=0, chunksize=None, usecols=None, typed_columns=()):
+    """
+    Stream an ods file as dataframes of (at most) chunksize rows (a single one if chunksize is None), without odfpy.
+    Values are read as strings, as with pandas.read_excel(dtype=str, keep_default_na=False),
+    except in typed_columns, where numbers, dates and times are kept as such.
+    If usecols is set, only these columns are kept
+    """
+    yield from _read_batches(_iter_ods_rows(source, sheet=sheet, row=row), chunksize, usecols, _convert_ods_value, typed_columns)
+
+
+def _convert_ods_value(value):
+    return "" if value is None else str(value)
+
+
+def read_xlsx_xml_header(source, sheet=0, row=0):
+    """ Read only the column names of an xlsx file, without openpyxl (an empty list if the sheet is empty) """
+    return _read_header(_iter_xlsx_rows(source, sheet=sheet, row=row)) or []
+
+
+def read_xlsx_xml(source, sheet=0, row=0, chunksize=None, usecols=None, typed_columns=()):
+    """
+    Stream an xlsx file as dataframes of (at most) chunksize rows (a single one if chunksize is None), without openpyxl.
+    Only the workbook, the styles, the sheet and its shared strings are read from the zip, with incremental XML parsing.
+    Values are read as with read_xlsx. If usecols is set, only these columns are kept
+    """
+    yield from _read_batches(_iter_xlsx_rows(source, sheet=sheet, row=row), chunksize, usecols, _convert_xlsx_value, typed_columns)
+
+
+def _read_batches(rows, chunksize, usecols, convert, typed_columns=()):
+    """
+    Yield the rows (after the header) as dataframes of (at most) chunksize rows, or a single one if chunksize is None.
+    Values are converted to strings with convert, except in typed_columns
+    """
+    header = _read_header(rows)
+    if header is None:
+        yield pandas.DataFrame()
+        return
+
+    width = len(header)
+    if usecols is None:
+        indexes = list(range(width))
+    else:
+        usecols = set(usecols)
+        indexes = [index for index, name in enumerate(header) if name in usecols]
+    columns = [header[index] for index in indexes]
+    converters = [_convert_typed_value if header[index] in typed_columns else convert for index in indexes]
+    batch = []
+    # Trailing empty rows are ignored, like pandas does
+    pending_empty = 0
+    yielded = False
+    for values in rows:
+        values = _trim_row(values)
+        if not values:
+            pending_empty += 1
+            continue
+        while pending_empty:
+            batch.append([""] * len(columns))
+            pending_empty -= 1
+            if len(batch) == chunksize:
+                yield pandas.DataFrame(batch, columns=columns)
+                yielded = True
+                batch = []
+        values.extend([None] * (width - len(values)))
+        batch.append([converter(values[index]) for converter, index in zip(converters, indexes)])
+        if len(batch) == chunksize:
+            yield pandas.DataFrame(batch, columns=columns)
+            yielded = True
+            batch = []
+
+    if batch or not yielded:
+        yield pandas.DataFrame(batch, columns=columns)
+
+
+_XLSX_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_XLSX_RELATIONSHIP_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_XLSX_SHEET_DATA = _XLSX_MAIN + "sheetData"
+_XLSX_ROW = _XLSX_MAIN + "row"
+_XLSX_VALUE = _XLSX_MAIN + "v"
+_XLSX_INLINE_STRING = _XLSX_MAIN + "is"
+_XLSX_TEXT = _XLSX_MAIN + "t"
+_XLSX_RICH_TEXT_RUN = _XLSX_MAIN + "r"
+_XLSX_STRING_ITEM = _XLSX_MAIN + "si"
+
+
+def _xlsx_text(element):
+    # Plain text of a shared or inline string: text, or rich text runs (phonetic runs are ignored)
+    parts = []
+    for child in element:
+        if child.tag == _XLSX_TEXT:
+            parts.append(child.text or "")
+        elif child.tag == _XLSX_RICH_TEXT_RUN:
+            parts.append(child.findtext(_XLSX_TEXT) or "")
+    return "".join(parts)
+
+
+class _SharedStrings(object):
+    """
+    Shared strings of an xlsx file, only read when a cell refers to them.
+    Kept as a single string, and an array of the offsets of each string
+    """
+
+    def __init__(self, archive, path):
+        self._archive = archive
+        self._path = path
+        self._text = None
+        self._offsets = None
+
+    def _load(self):
+        text = io.StringIO()
+        offsets = array("q", [0])
+        if self._path in self._archive.NameToInfo:
+            with self._archive.open(self._path) as content:
+                root = None
+                for event, element in iterparse(content, events=("start", "end")):
+                    if root is None:
+                        root = element
+                    if event == "end" and element.tag == _XLSX_STRING_ITEM:
+                        offsets.append(offsets[-1] + text.write(_xlsx_text(element)))
+                        root.remove(element)
+        self._text = text.getvalue()
+        self._offsets = offsets
+
+    def __getitem__(self, index):
+        if self._text is None:
+            self._load()
+        return self._text[self._offsets[index]:self._offsets[index + 1]]
+
+
+def _xlsx_relationships(archive, path):
+    """ Targets of the relationships of a part of the file, as {id: (type, path)} """
+    directory, name = posixpath.split(path)
+    relationships_path = posixpath.join(directory, "_rels", name + ".rels")
+    if relationships_path not in archive.NameToInfo:
+        return {}
+    relationships = {}
+    for relationship in fromstring(archive.read(relationships_path)).iter(_XLSX_RELATIONSHIPS + "Relationship"):
+        target = relationship.get("Target")
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(directory, target))
+        relationships[relationship.get("Id")] = (relationship.get("Type").rsplit("/", 1)[-1], target)
+    return relationships
+
+
+def _xlsx_date_styles(archive, path):
+    """ Indexes of the cell styles formatting numbers as dates, and as durations (as openpyxl does) """
+    date_styles = set()
+    timedelta_styles = set()
+    if path is None or path not in archive.NameToInfo:
+        return date_styles, timedelta_styles
+    styles = fromstring(archive.read(path))
+    custom_formats = {int(number_format.get("numFmtId")): number_format.get("formatCode") for number_format in styles.iter(_XLSX_MAIN + "numFmt")}
+    cell_formats = styles.find(_XLSX_MAIN + "cellXfs")
+    for index, cell_format in enumerate(cell_formats if cell_formats is not None else []):
+        format_id = int(cell_format.get("numFmtId", 0))
+        code = custom_formats.get(format_id) or builtin_format_code(format_id)
+        if code and is_date_format(code):
+            date_styles.add(index)
+        if code and is_timedelta_format(code):
+            timedelta_styles.add(index)
+    return date_styles, timedelta_styles
+
+
+_XLSX_COLUMNS = {}
+
+
+def _xlsx_column_index(reference):
+    letters = reference.rstrip("0123456789")
+    index = _XLSX_COLUMNS.get(letters)
+    if index is None:
+        index = 0
+        for letter in letters:
+            index = index * 26 + ord(letter) - 64
+        index = _XLSX_COLUMNS[letters] = index - 1
+    return index
+
+
+def _iter_xlsx_rows(source, sheet=0, row=0):
+    """
+    Yield the rows of a worksheet of an xlsx file as lists of values (None for empty cells), skipping the first row rows.
+    Values are converted as openpyxl does (numbers, dates, booleans). The sheet is parsed incrementally,
+    and its rows are discarded once read
+    """
+    with zipfile.ZipFile(source) as archive:
+        workbook_path = "xl/workbook.xml"
+        relationships = _xlsx_relationships(archive, workbook_path)
+        workbook = fromstring(archive.read(workbook_path))
+        properties = workbook.find(_XLSX_MAIN + "workbookPr")
+        epoch = MAC_EPOCH if properties is not None and properties.get("date1904") in ("1", "true") else WINDOWS_EPOCH
+        # Chartsheets are not counted, as with openpyxl's worksheets
+        worksheets = [
+            relationships[element.get(_XLSX_RELATIONSHIP_ID)][1] for element in workbook.iter(_XLSX_MAIN + "sheet")
+            if relationships.get(element.get(_XLSX_RELATIONSHIP_ID), ("",))[0] == "worksheet"
+        ]
+        parts = {part_type: path for part_type, path in relationships.values()}
+        shared_strings = _SharedStrings(archive, parts.get("sharedStrings", "xl/sharedStrings.xml"))
+        date_styles, timedelta_styles = _xlsx_date_styles(archive, parts.get("styles"))
+
+        with archive.open(worksheets[sheet]) as content:
+            sheet_data = None
+            row_number = 0
+            for event, element in iterparse(content, events=("start", "end")):
+                if event == "start":
+                    if element.tag == _XLSX_SHEET_DATA:
+                        sheet_data = element
+                    continue
+                if element.tag != _XLSX_ROW:
+                    continue
+
+                previous = row_number
+                row_number = int(element.get("r", row_number + 1))
+                if row_number > row:
+                    # Missing rows are empty
+                    for _ in range(max(previous, row) + 1, row_number):
+                        yield []
+                    yield _xlsx_row_values(element, shared_strings, date_styles, timedelta_styles, epoch)
+                sheet_data.remove(element)
+
+
+def _xlsx_row_values(row, shared_strings, date_styles, timedelta_styles, epoch):
+    values = []
+    column = -1
+    for cell in row:
+        reference = cell.get("r")
+        column = _xlsx_column_index(reference) if reference else column + 1
+        data_type = cell.get("t", "n")
+        if data_type == "inlineStr":
+            inline_string = cell.find(_XLSX_INLINE_STRING)
+            value = _xlsx_text(inline_string) if inline_string is not None else None
+        else:
+            value = cell.findtext(_XLSX_VALUE) or None
+            if value is None:
+                continue
+            if data_type == "n":
+                value = float(value) if "." in value or "E" in value or "e" in value else int(value)
+                style = int(cell.get("s", 0))
+                if style in date_styles:
+                    try:
+                        value = from_excel(value, epoch, timedelta=style in timedelta_styles)
+                    except (OverflowError, ValueError):
+                        value = "#VALUE!"
+            elif data_type == "s":
+                value = shared_strings[int(value)]
+            elif data_type == "b":
+                value = bool(int(value))
+            elif data_type == "d":
+                value = from_ISO8601(value)
+        if value is None:
+            continue
+        values.extend([None] * (column - len(values)))
+        values.append(value)
+    return values
+
+
+def _ods_tag(namespace, name):
+    return "{{{}}}{}".format(_ODS_NAMESPACES[namespace], name)
+
+
+_ODS_NAMESPACES = {
+    "office": "urn:oasis:names:tc:opendocument:xmlns:office:1.0",
+    "table": "urn:oasis:names:tc:opendocument:xmlns:table:1.0",
+    "text": "urn:oasis:names:tc:opendocument:xmlns:text:1.0",
+}
+_ODS_TABLE = _ods_tag("table", "table")
+_ODS_ROW = _ods_tag("table", "table-row")
+_ODS_CELL = _ods_tag("table", "table-cell")
+_ODS_COVERED_CELL = _ods_tag("table", "covered-table-cell")
+_ODS_ROWS_REPEATED = _ods_tag("table", "number-rows-repeated")
+_ODS_COLUMNS_REPEATED = _ods_tag("table", "number-columns-repeated")
+_ODS_VALUE_TYPE = _ods_tag("office", "value-type")
+_ODS_VALUE = _ods_tag("office", "value")
+_ODS_DATE_VALUE = _ods_tag("office", "date-value")
+_ODS_TIME_VALUE = _ods_tag("office", "time-value")
+_ODS_BOOLEAN_VALUE = _ods_tag("office", "boolean-value")
+_ODS_ANNOTATION = _ods_tag("office", "annotation")
+_ODS_SPACES = _ods_tag("text", "s")
+_ODS_SPACE_COUNT = _ods_tag("text", "c")
+_ODS_DURATION = re.compile(r"PT(\d+)H(\d+)M(\d+(?:\.\d+)?)S")
+
+
+def _ods_text(element):
+    # Text of a cell, with the repeated spaces (text:s) expanded, and without annotations
+    parts = [element.text.strip("\n")] if element.text else []
+    for child in element:
+        if child.tag == _ODS_SPACES:
+            parts.append(" " * int(child.get(_ODS_SPACE_COUNT, 1)))
+        elif child.tag != _ODS_ANNOTATION:
+            parts.append(_ods_text(child))
+        if child.tail:
+            parts.append(child.tail.strip("\n"))
+    return "".join(parts)
+
+
+def _ods_cell_value(cell):
+    # Same values as pandas' odf reader
+    if cell.tag == _ODS_COVERED_CELL:
+        return None
+    value_type = cell.get(_ODS_VALUE_TYPE)
+    if value_type is None:
+        return None
+    if value_type == "string":
+        return _ods_text(cell) or None
+    if _ods_text(cell) == "#N/A":
+        return None
+    if value_type == "float":
+        value = float(cell.get(_ODS_VALUE))
+        return int(value) if value.is_integer() else value
+    if value_type in ("percentage", "currency"):
+        return float(cell.get(_ODS_VALUE))
+    if value_type == "boolean":
+        return cell.get(_ODS_BOOLEAN_VALUE, "").lower() == "true"
+    if value_type == "date":
+        return pandas.Timestamp(cell.get(_ODS_DATE_VALUE))
+    if value_type == "time":
+        match = _ODS_DURATION.fullmatch(cell.get(_ODS_TIME_VALUE, ""))
+        if match:
+            hours, minutes, seconds = match.groups()
+            return (datetime.datetime.min + datetime.timedelta(hours=int(hours), minutes=int(minutes), seconds=float(seconds))).time()
+        return _ods_text(cell)
+    raise ValueError("Unrecognized type {}".format(value_type))
+
+
+def _ods_row_values(row):
+    values = []
+    # Empty cells are only added when followed by a value: trailing empty cells (often repeated thousands of times) are dropped
+    pending_empty = 0
+    for cell in row:
+        if cell.tag not in (_ODS_CELL, _ODS_COVERED_CELL):
+            continue
+        value = _ods_cell_value(cell)
+        repeat = int(cell.get(_ODS_COLUMNS_REPEATED, 1))
+        if value is None:
+            pending_empty += repeat
+            continue
+        values.extend([None] * pending_empty)
+        pending_empty = 0
+        values.extend([value] * repeat)
+    return values
+
+
+def _iter_ods_rows(source, sheet=0, row=0):
+    """
+    Yield the rows of a sheet of an ods file as lists of values (None for empty cells), skipping the first row rows.
+    content.xml is parsed incrementally: rows are discarded once read, and repeated rows are expanded lazily
+    """
+    with zipfile.ZipFile(source) as archive, archive.open("content.xml") as content:
+        table_index = -1
+        in_table = False
+        skipped = 0
+        # Empty rows are only yielded when followed by a row with values
+        pending_empty = 0
+        parents = []
+        for event, element in iterparse(content, events=("start", "end")):
+            if event == "start":
+                if element.tag == _ODS_TABLE:
+                    table_index += 1
+                    in_table = table_index == sheet
+                parents.append(element)
+                continue
+
+            parents.pop()
+            if element.tag == _ODS_TABLE and in_table:
+                return
+            if element.tag != _ODS_ROW:
+                continue
+            if in_table:
+                values = _ods_row_values(element)
+                repeat = int(element.get(_ODS_ROWS_REPEATED, 1))
+                if skipped < row:
+                    skipped_now = min(repeat, row - skipped)
+                    skipped += skipped_now
+                    repeat -= skipped_now
+                if repeat:
+                    if not values:
+                        pending_empty += repeat
+                    else:
+                        for _ in range(pending_empty):
+                            yield []
+                        pending_empty = 0
+                        for _ in range(repeat):
+                            yield list(values)
+            # Rows are dropped once read, so the document is never held in memory
+            if parents:
+                parents[-1].remove(element)
+
+
+def read_excel_typed(source, sheet=0, row=0, usecols=None, typed_columns=()):
+    """
+    Read a spreadsheet with pandas, keeping the numbers, dates and times of typed_columns as such.
+    The other columns are strings, as with pandas.read_excel(dtype=str, keep_default_na=False)
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        df = pandas.read_excel(source, sheet_name=sheet, keep_default_na=False, skiprows=row, dtype=object, usecols=usecols)
+    for column in df.columns:
+        df[column] = df[column].map(_convert_typed_value) if column in typed_columns else df[column].astype(str)
+    return df
+
+
+def read_csv_arrow(source, delimiter=",", row=0, chunksize=None, usecols=None):
+    """
+    Read a csv file with pyarrow, as Arrow-backed string columns (no type inference, no NA detection).
+    Yield a single dataframe, or dataframes of (at most) chunksize rows
+    """
+    parse_options = pyarrow_csv.ParseOptions(delimiter=delimiter)
+    with pyarrow_csv.open_csv(source, read_options=pyarrow_csv.ReadOptions(skip_rows=row), parse_options=parse_options) as reader:
+        header = _format_header(reader.schema.names)
+
+    # Column names are set (with the same naming as pandas), so the header row is skipped
+    read_options = pyarrow_csv.ReadOptions(skip_rows=row + 1, column_names=header)
+    convert_options = pyarrow_csv.ConvertOptions(
+        column_types={name: pyarrow.string() for name in header},
+        strings_can_be_null=False,
+        include_columns=[name for name in header if name in set(usecols)] if usecols is not None else None
+    )
+
+    if not chunksize:
+        table = pyarrow_csv.read_csv(source, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+        yield table.to_pandas(types_mapper=pandas.ArrowDtype)
+        return
+
+    with pyarrow_csv.open_csv(source, read_options=read_options, parse_options=parse_options, convert_options=convert_options) as reader:
+        batches = []
+        row_count = 0
+        yielded = False
+        for batch in reader:
+            batches.append(batch)
+            row_count += batch.num_rows
+            if row_count < chunksize:
+                continue
+            table = pyarrow.Table.from_batches(batches)
+            start = 0
+            while row_count - start >= chunksize:
+                yield table.slice(start, chunksize).to_pandas(types_mapper=pandas.ArrowDtype)
+                yielded = True
+                start += chunksize
+            batches = table.slice(start).to_batches()
+            row_count -= start
+        if row_count or not yielded:
+            yield pyarrow.Table.from_batches(batches, schema=reader.schema).to_pandas(types_mapper=pandas.ArrowDtype)
@@ -0,0 +1,229 @@
+import datetime
+import os
+import pickle
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+import numpy
+import pandas
+
+# Default memory budget (in MB) of the values kept in memory by a disk store
+UNIQUE_MEMORY_LIMIT = 1024
+# Estimated memory of a dict entry (hash, pointers, row number), on top of the value itself
+ENTRY_OVERHEAD = 100
+# Bloom filters: bits per spilled value & hashes per value (about 1% of false positives)
+BLOOM_BITS = 10
+BLOOM_HASHES = 7
+# Maximal number of values per SQLite query
+QUERY_SIZE = 500
+
+
+def _hashes(keys):
+    """ Hashes of the keys, stable across processes (unlike hash()) """
+    return pandas.util.hash_array(numpy.array(keys, dtype=object)).astype(numpy.uint64)
+
+
+def _key(value):
+    """
+    Key of a value in the disk table: values equal as dict keys get the same key (1, 1.0 and True, numpy & python numbers...).
+    None for values holding NaN, which are not equal to themselves
+    """
+    if type(value) is str:
+        return repr(value)
+    try:
+        return repr(_canonical(value))
+    except ValueError:
+        return None
+
+
+def _canonical(value):
+    if isinstance(value, tuple):
+        return tuple(_canonical(item) for item in value)
+    if isinstance(value, numpy.generic):
+        value = value.item()
+    if isinstance(value, pandas.Timestamp):
+        value = value.to_pydatetime(warn=False)
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float):
+        if value != value:
+            raise ValueError("NaN has no key")
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def _value_size(value):
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class BloomFilter(object):
+    """ Compact filter of a set of hashes: a hash not in the filter was not added, a hash in the filter may have been """
+
+    def __init__(self, hashes):
+        self._size = max(64, BLOOM_BITS * len(hashes))
+        self._bits = numpy.zeros((self._size + 7) // 8, dtype=numpy.uint8)
+        positions = self._positions(hashes).ravel()
+        numpy.bitwise_or.at(self._bits, positions >> numpy.uint64(3), numpy.uint8(1) << (positions & numpy.uint64(7)).astype(numpy.uint8))
+
+    def _positions(self, hashes):
+        # Double hashing: the i-th position is h1 + i * h2
+        first = hashes & numpy.uint64(0xFFFFFFFF)
+        step = (hashes >> numpy.uint64(32)) | numpy.uint64(1)
+        return (first[:, None] + numpy.arange(BLOOM_HASHES, dtype=numpy.uint64)[None, :] * step[:, None]) % numpy.uint64(self._size)
+
+    def contains(self, hashes):
+        """ Mask of the hashes which may be in the filter """
+        positions = self._positions(hashes)
+        return ((self._bits[positions >> numpy.uint64(3)] >> (positions & numpy.uint64(7)).astype(numpy.uint8)) & 1).all(axis=1)
+
+
+class MemoryValues(object):
+    """ Values already seen by a validator, with the row of their first occurrence, in a dict """
+
+    def __init__(self):
+        self._values = {}
+
+    def __contains__(self, value):
+        return value in self._values
+
+    def __setitem__(self, value, row_number):
+        self._values[value] = row_number
+
+    def __len__(self):
+        return len(self._values)
+
+    def update(self, items):
+        self._values.update(items)
+
+    def seen(self, values):
+        """ Mask of the values (a list) already seen """
+        seen = self._values.keys() & values if self._values else ()
+        if not seen:
+            return numpy.zeros(len(values), dtype=bool)
+        return numpy.array([value in seen for value in values], dtype=bool)
+
+    def items(self):
+        """ (value, row) of the values seen, in row order """
+        return sorted(self._values.items(), key=lambda item: item[1])
+
+    def close(self):
+        """ Release the resources of the store """
+        pass
+
+
+class DiskValues(MemoryValues):
+    """
+    Values already seen, kept in memory up to memory_limit (in MB), then spilled to a SQLite table on disk.
+    Each spilled batch gets a Bloom filter: the table is only queried for values which may be in it
+    """
+
+    def __init__(self, memory_limit=UNIQUE_MEMORY_LIMIT, directory=None):
+        super(DiskValues, self).__init__()
+        self.memory_limit = memory_limit
+        # Where the SQLite file is created (default temporary directory if None)
+        self.directory = directory
+        self.path = None
+        self._connection = None
+        self._filters = []
+        self._memory = 0
+
+    def __getstate__(self):
+        # The connection is opened again when needed (after being sent to another process)
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    def __contains__(self, value):
+        return bool(self.seen([value])[0])
+
+    def __setitem__(self, value, row_number):
+        self._values[value] = row_number
+        self._memory += _value_size(value) + ENTRY_OVERHEAD
+        self._spill_if_needed()
+
+    def __len__(self):
+        return len(self._values) + (self._table().execute("SELECT COUNT(*) FROM seen").fetchone()[0] if self.path else 0)
+
+    def update(self, items):
+        items = list(items)
+        self._values.update(items)
+        # Average size estimated on the first values
+        sample = items[:100]
+        if sample:
+            self._memory += len(items) * (sum(_value_size(value) for value, row in sample) // len(sample) + ENTRY_OVERHEAD)
+        self._spill_if_needed()
+
+    def seen(self, values):
+        mask = super(DiskValues, self).seen(values)
+        if not self._filters:
+            return mask
+        candidates = numpy.flatnonzero(~mask)
+        keys = [_key(values[index]) for index in candidates.tolist()]
+        # Values with NaN were not spilled
+        candidates = candidates[numpy.array([key is not None for key in keys], dtype=bool)]
+        keys = [key for key in keys if key is not None]
+        if not keys:
+            return mask
+        hashes = _hashes(keys)
+        maybe = numpy.zeros(len(keys), dtype=bool)
+        for bloom_filter in self._filters:
+            maybe |= bloom_filter.contains(hashes)
+
+        # Values which may have been spilled: exact check in the table
+        maybe_keys = [key for key, is_maybe in zip(keys, maybe.tolist()) if is_maybe]
+        found = set()
+        for start in range(0, len(maybe_keys), QUERY_SIZE):
+            batch = maybe_keys[start:start + QUERY_SIZE]
+            query = "SELECT key FROM seen WHERE key IN ({})".format(",".join("?" * len(batch)))
+            found.update(key for key, in self._table().execute(query, batch))
+        if found:
+            mask[candidates[[key in found for key in keys]]] = True
+        return mask
+
+    def items(self):
+        items = list(self._values.items())
+        if self.path:
+            items.extend((pickle.loads(value), row) for value, row in self._table().execute("SELECT value, row FROM seen"))
+        return sorted(items, key=lambda item: item[1])
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+        if self.path:
+            shutil.rmtree(os.path.dirname(self.path), ignore_errors=True)
+        self._values = {}
+        self._memory = 0
+        self._filters = []
+        self._connection = None
+        self.path = None
+
+    def _table(self):
+        if self._connection is None:
+            if self.path is None:
+                self.path = os.path.join(tempfile.mkdtemp(prefix="checkcel_", dir=self.directory), "unique.sqlite")
+            self._connection = sqlite3.connect(self.path)
+            # The file is only a spill area: no need for durability
+            self._connection.execute("PRAGMA journal_mode = OFF")
+            self._connection.execute("PRAGMA synchronous = OFF")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, row INTEGER, value BLOB) WITHOUT ROWID")
+        return self._connection
+
+    def _spill_if_needed(self):
+        if self._memory <= self.memory_limit * 1024 * 1024:
+            return
+        # Values with NaN can only be found again from their object: they are not kept
+        rows = [(key, row, pickle.dumps(value)) for key, (value, row) in zip(map(_key, self._values), self._values.items()) if key is not None]
+        keys = [key for key, row, value in rows]
+        connection = self._table()
+        connection.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)", rows)
+        connection.commit()
+        self._filters.append(BloomFilter(_hashes(keys)))
+        self._values = {}
+        self._memory = 0
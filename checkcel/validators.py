@@ -9,21 +9,106 @@ from openpyxl.workbook.defined_name import DefinedName
 from urllib.parse import quote_plus
 from dateutil import parser
 
+from bisect import bisect_left
 from collections import defaultdict
+from copy import copy
+import datetime
 
-from checkcel.exceptions import ValidationException, BadValidatorException
+import numpy
+import pandas
+
+from checkcel.exceptions import BadValidatorException
+from checkcel.failures import RowSet, ValidationFailure
+from checkcel.unicity import DiskValues, MemoryValues, UNIQUE_MEMORY_LIMIT
+from checkcel import failures
 from checkcel import logs
 
 
+class _RowNeeded(Exception):
+    """ Raised when checking a value needs the rest of its row """
+
+    pass
+
+
+class _NoRow(object):
+    """ Stands for the row when checking distinct values """
+
+    def __getitem__(self, key):
+        raise _RowNeeded
+
+
+_NO_ROW = _NoRow()
+_ROW_DEPENDENT = _RowNeeded()
+
+# Simple local parts of email addresses (ASCII dot-atoms), checked without email_validator
+_EMAIL_LOCAL_PART = re.compile(r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*")
+# Maximal lengths of a local part & of an address (RFC 5321)
+_EMAIL_LOCAL_PART_LENGTH = 64
+_EMAIL_LENGTH = 254
+
+# HH:MM[:SS[.ffffff]] times, parsed without dateutil
+_TIME_PATTERN = r"^(\d{1,2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?$"
+_MICROSECONDS_PER_DAY = 86400 * 10**6
+
+
+def _factorize(column):
+    """
+    Dictionary encoding of a column: the code of each row, and the distinct values in order of first occurrence.
+    Missing values (NaN, None) are kept as values
+    """
+    if isinstance(column.dtype, pandas.CategoricalDtype):
+        # Only the categories used in the column are kept, in order of first occurrence
+        codes, used = pandas.factorize(column.cat.codes.to_numpy())
+        categories = column.cat.categories.to_numpy(dtype=object)
+        return codes, [categories[code] if code >= 0 else numpy.nan for code in used.tolist()]
+    values = column.to_numpy() if column.dtype == object else column
+    codes, distinct_values = pandas.factorize(values)
+    missing = codes < 0
+    if not missing.any():
+        return codes, distinct_values.tolist()
+    # Missing values get their own code (use_na_sentinel=False needs pandas >= 1.5), in order of first occurrence
+    distinct_values = distinct_values.tolist()
+    distinct_values.extend(column.iloc[[int(missing.argmax())]].tolist())
+    codes, order = pandas.factorize(numpy.where(missing, len(distinct_values) - 1, codes))
+    return codes, [distinct_values[code] for code in order.tolist()]
+
+
+def _is_number(field):
+    return isinstance(field, (int, float)) and not isinstance(field, bool)
+
+
+def _as_text(field):
+    """ Text of a native value (number, date or time), as it is read without native_types """
+    if isinstance(field, float) and field.is_integer():
+        field = int(field)
+    return str(field)
+
+
+def _parse_floats(texts):
+    """ float() of each text, at once if possible. Return the numbers, and the mask of the texts which are not numbers """
+    not_numbers = numpy.zeros(len(texts), dtype=bool)
+    try:
+        return numpy.array(texts, dtype=object).astype(float), not_numbers
+    except ValueError:
+        pass
+    numbers = numpy.full(len(texts), numpy.nan)
+    for index, text in enumerate(texts):
+        try:
+            numbers[index] = float(text)
+        except ValueError:
+            not_numbers[index] = True
+    return numbers, not_numbers
+
+
 class Validator(object):
     """ Generic Validator class """
 
-    def __init__(self, empty_ok=None, ignore_case=None, ignore_space=None, empty_ok_if=None, empty_ok_unless=None, readme=None, unique=None, na_ok=None, skip_generation=None, skip_validation=None):
+    def __init__(self, empty_ok=None, ignore_case=None, ignore_space=None, empty_ok_if=None, empty_ok_unless=None, readme=None, unique=None, na_ok=None, skip_generation=None, skip_validation=None, unique_backend=None, unique_memory_limit=None):
         self.logger = logs.logger
         self.invalid_dict = {
             "invalid_set": set(),
-            "invalid_rows": set(),
-            "invalid_unique": defaultdict(set)
+            "invalid_rows": RowSet(),
+            "invalid_unique": defaultdict(RowSet)
         }
 
         self.fail_count = 0
@@ -36,7 +121,10 @@ class Validator(object):
         self.empty_check = True if not (empty_ok_if or empty_ok_unless) else False
         self.readme = readme
         self.unique = unique
-        self.unique_values = set()
+        self.unique_backend = unique_backend
+        self.unique_memory_limit = unique_memory_limit
+        # Values already seen, with the row of their first occurrence
+        self.unique_values = self._new_unique_values()
         self.skip_generation = skip_generation
         self.skip_validation = skip_validation
 
@@ -95,10 +183,329 @@ class Validator(object):
     def bad(self):
         raise NotImplementedError
 
+    @property
+    def context_columns(self):
+        """ Other columns needed as row context during validation """
+        columns = []
+        for linked in (self.empty_ok_if, self.empty_ok_unless):
+            if isinstance(linked, dict):
+                columns.extend(linked.keys())
+            elif isinstance(linked, str):
+                columns.append(linked)
+            elif isinstance(linked, list):
+                columns.extend(linked)
+        return columns
+
     def validate(self, field, row_number, row):
         """ Validate the given field. Also is given the row context """
+        if self.skip_validation:
+            return None
+
+        self._precheck(row)
+        value = self._check(field, row)
+        if isinstance(value, ValidationFailure):
+            self.invalid_dict["invalid_rows"].add(row_number)
+            raise value
+        if value:
+            failure = self._check_unique(value, row_number)
+            if failure:
+                raise failure
+
+    def validate_column(self, column, first_row, context, limit=None):
+        """
+        Validate a whole column (a pandas Series), whose first value is at row first_row.
+        The context dataframe holds the related columns.
+        If limit is set, validation stops at the limit-th failure: the following rows are not checked.
+        Return a boolean failure mask, the errors of the failing rows (in order), and whether the limit
+        left some rows unchecked or some failures out
+        """
+        full_mask = numpy.zeros(len(column), dtype=bool)
+        if self.skip_validation or not len(column):
+            return full_mask, [], False
+
+        self._precheck(context)
+
+        # Dictionary encoding: each distinct value is checked once, and the verdict is
+        # broadcast to its rows. Verdicts depending on the rest of the row are done row by row
+        codes, distinct_values = _factorize(column)
+        self._prepare(distinct_values)
+        checked, end = self._check_distinct_values(codes, distinct_values, limit)
+        codes = codes[:end]
+        # Object arrays cannot be built with numpy.fromiter before numpy 1.23
+        verdict_types = numpy.array([type(verdict) for verdict in checked], dtype=object)
+        failed = verdict_types == ValidationFailure
+        row_dependent = verdict_types == _RowNeeded
+        row_errors = numpy.empty(end, dtype=object)
+
+        mask = failed[codes]
+        checked_list = numpy.empty(len(checked), dtype=object)
+        checked_list[:] = checked
+        row_errors[mask] = checked_list[codes[mask]]
+        checked_list[failed | row_dependent] = None
+        # NaN is not equal to itself: it is kept out of the unicity values (as was the case row by row)
+        checked_list[checked_list != checked_list] = None
+        unicity_values = checked_list.tolist()
+
+        dependent_rows = numpy.flatnonzero(row_dependent[codes])
+        if len(dependent_rows):
+            context_columns = [col for col in dict.fromkeys(self.context_columns) if col in context]
+            # Rows with the same value and the same context share their verdict:
+            # each distinct (value, context values) combination is checked once
+            keys = pandas.DataFrame({0: codes[dependent_rows]})
+            for position, col in enumerate(context_columns):
+                keys[position + 1] = _factorize(context[col].iloc[dependent_rows])[0]
+            groups = keys.groupby(list(keys.columns), sort=False).ngroup().to_numpy()
+            first_rows = dependent_rows[numpy.unique(groups, return_index=True)[1]]
+            rows = {col: context[col].take(first_rows).tolist() for col in context_columns}
+            verdicts = numpy.empty(len(first_rows), dtype=object)
+            verdicts[:] = self._check_rows([distinct_values[code] for code in codes[first_rows].tolist()], rows)
+
+            group_failed = numpy.array([type(verdict) for verdict in verdicts], dtype=object) == ValidationFailure
+            row_failed = group_failed[groups]
+            mask[dependent_rows[row_failed]] = True
+            row_errors[dependent_rows[row_failed]] = verdicts[groups[row_failed]]
+            # Row-dependent values get their own unicity value
+            codes[dependent_rows[~row_failed]] = len(unicity_values) + groups[~row_failed]
+            verdicts[group_failed] = None
+            verdicts[verdicts != verdicts] = None
+            unicity_values.extend(verdicts.tolist())
+        self._prepare(())
+
+        value_failures = numpy.flatnonzero(mask)
+
+        if self._checks_unique() and limit is None:
+            self._check_unique_column(codes, unicity_values, mask, row_errors, first_row)
+        elif self._checks_unique():
+            # Unicity depends on the previous rows: done in order
+            unique_failures = 0
+            for index in numpy.flatnonzero(~mask).tolist():
+                if limit is not None and unique_failures + bisect_left(value_failures, index) >= limit:
+                    end = min(end, index)
+                    break
+                value = unicity_values[codes[index]]
+                if value:
+                    failure = self._check_unique(value, first_row + index)
+                    if failure:
+                        mask[index] = True
+                        row_errors[index] = failure
+                        unique_failures += 1
+
+        failing = numpy.flatnonzero(mask)
+        truncated = end < len(column)
+        if limit is not None and len(failing) > limit:
+            mask[failing[limit:]] = False
+            value_failures = value_failures[value_failures <= failing[limit - 1]]
+            truncated = True
+
+        self.invalid_dict["invalid_rows"].update((value_failures + first_row).tolist())
+        full_mask[:len(mask)] = mask
+        return full_mask, row_errors[mask].tolist(), truncated
+
+    def _check_rows(self, fields, rows):
+        """ Check fields depending on their row: rows holds the list of the related values of each context column """
+        return [self._check(field, {col: values[index] for col, values in rows.items()}) for index, field in enumerate(fields)]
+
+    def _check_unique_column(self, codes, unicity_values, mask, row_errors, first_row):
+        """
+        Unicity check of the rows which did not fail, at once (failures are stored in mask and row_errors).
+        Duplicates are reported value by value
+        """
+        # Equal unicity values (Ex: '1' and '1.0' for numbers) share an id. Empty values are not checked
+        values = numpy.empty(len(unicity_values), dtype=object)
+        values[:] = unicity_values
+        checked = values.astype(bool)
+        ids = dict.fromkeys(values[checked].tolist())
+        if len(ids) == checked.sum():
+            value_ids = numpy.full(len(values), -1, dtype=numpy.int64)
+            value_ids[checked] = numpy.arange(len(ids))
+        else:
+            ids = {}
+            value_ids = numpy.array([ids.setdefault(value, len(ids)) if value else -1 for value in unicity_values], dtype=numpy.int64)
+        rows = numpy.flatnonzero(~mask)
+        row_ids = value_ids[codes[rows]]
+        rows, row_ids = rows[row_ids >= 0], row_ids[row_ids >= 0]
+        duplicated = pandas.Series(row_ids).duplicated().to_numpy()
+
+        # First occurrences in this part of the column, unless already seen in the previous rows
+        values = list(ids)
+        first_values = [values[value_id] for value_id in row_ids[~duplicated].tolist()]
+        first_rows = rows[~duplicated]
+        seen_mask = self.unique_values.seen(first_values)
+        if seen_mask.any():
+            self.unique_values.update((value, row + first_row) for value, row, is_seen in zip(first_values, first_rows.tolist(), seen_mask) if not is_seen)
+            duplicate_rows = numpy.concatenate([rows[duplicated], first_rows[seen_mask]])
+            duplicate_ids = numpy.concatenate([row_ids[duplicated], row_ids[~duplicated][seen_mask]])
+        else:
+            self.unique_values.update(zip(first_values, (first_rows + first_row).tolist()))
+            duplicate_rows = rows[duplicated]
+            duplicate_ids = row_ids[duplicated]
+
+        # Rows of each duplicated value
+        order = numpy.argsort(duplicate_ids, kind="stable")
+        duplicate_rows, duplicate_ids = duplicate_rows[order], duplicate_ids[order]
+        starts = numpy.flatnonzero(numpy.diff(duplicate_ids)) + 1
+        for value_id, value_rows in zip(duplicate_ids[numpy.concatenate([[0], starts])].tolist() if len(duplicate_ids) else [], numpy.split(duplicate_rows, starts)):
+            field, failure = self._duplicate(values[value_id])
+            self.invalid_dict["invalid_unique"][field].update((numpy.sort(value_rows) + first_row).tolist())
+            mask[value_rows] = True
+            row_errors[value_rows] = failure
+
+    def _check_distinct_values(self, codes, distinct_values, limit):
+        """
+        Check the distinct values of a column, in order of first occurrence, until the rows
+        covered hold limit failures. Return the verdicts, and the number of rows they cover
+        """
+        if limit is None:
+            return [self._check_distinct(value) for value in distinct_values], len(codes)
+
+        # Rows between the first occurrences of two successive values only hold values already checked
+        first_rows = numpy.unique(codes, return_index=True)[1].tolist() + [len(codes)]
+        checked = []
+        failed = numpy.zeros(len(distinct_values), dtype=bool)
+        failure_count = 0
+        for index, value in enumerate(distinct_values):
+            checked.append(self._check_distinct(value))
+            failed[index] = isinstance(checked[-1], ValidationFailure)
+            segment_failures = numpy.flatnonzero(failed[codes[first_rows[index]:first_rows[index + 1]]])
+            if failure_count + len(segment_failures) >= limit:
+                return checked, first_rows[index] + int(segment_failures[limit - failure_count - 1]) + 1
+            failure_count += len(segment_failures)
+        return checked, len(codes)
+
+    def _skipped_texts(self, fields):
+        """
+        For the distinct values of a text column (normalized, as a Series), checked at once: return the masks of the
+        values which are not checked (empty values allowed to be empty, NA values if na_ok), and of the empty values
+        whose verdict depends on the row
+        """
+        empty = (fields == "").to_numpy()
+        skipped = numpy.zeros(len(fields), dtype=bool)
+        row_dependent = numpy.zeros(len(fields), dtype=bool)
+        if empty.any():
+            try:
+                if self._can_be_empty(_NO_ROW):
+                    skipped = empty
+            except _RowNeeded:
+                row_dependent = empty
+        if self.na_ok:
+            skipped = skipped | fields.str.lower().isin(['na', 'n/a']).to_numpy()
+        return skipped, row_dependent
+
+    def _text_verdicts(self, fields, skipped, row_dependent, failed, failure):
+        """ Verdicts of the distinct values of a text column checked at once: failure(field) for the failed ones """
+        verdicts = numpy.empty(len(fields), dtype=object)
+        verdicts[:] = fields.tolist()
+        verdicts[skipped] = None
+        verdicts[row_dependent] = _ROW_DEPENDENT
+        for index in numpy.flatnonzero(failed).tolist():
+            verdicts[index] = failure(verdicts[index])
+        return verdicts
+
+    def _limit_verdicts(self, codes, verdicts, failed, limit, reported=None):
+        """
+        For verdicts of distinct values made at once (failed being their failure mask): return them, with the
+        number of rows they cover until limit failures. The failing values met in these rows are reported
+        (the first value of their failure, unless reported holds the value to report for each verdict)
+        """
+        end = len(codes)
+        if limit is not None:
+            failing_rows = numpy.flatnonzero(failed[codes])
+            if len(failing_rows) >= limit:
+                end = int(failing_rows[limit - 1]) + 1
+        met = numpy.zeros(len(verdicts), dtype=bool)
+        met[codes[:end]] = True
+        failing = numpy.flatnonzero(failed & met).tolist()
+        if reported is None:
+            self.invalid_dict["invalid_set"].update(verdicts[index].values[0] for index in failing)
+        else:
+            self.invalid_dict["invalid_set"].update(reported[index] for index in failing)
+        return verdicts.tolist(), end
+
+    def _prepare(self, distinct_values):
+        """ Hook to process the distinct values of a column at once (vectorized), before they are checked one by one """
+        pass
+
+    def _check_distinct(self, field):
+        """ Check a value without its row """
+        try:
+            return self._check(field, _NO_ROW)
+        except _RowNeeded:
+            return _ROW_DEPENDENT
+
+    def _precheck(self, row):
+        """ Make sure the related columns are in the file (row is either a row or the whole dataframe) """
+        if not self.empty_check:
+            self._precheck_empty_ok_if(row)
+
+    def _check(self, field, row):
+        """
+        Check the field, without the unicity check. Return a ValidationFailure if invalid,
+        else the value to check for unicity (or None)
+        """
         raise NotImplementedError
 
+    def _checks_unique(self):
+        return self.unique
+
+    def _check_unique(self, value, row_number):
+        """ Return a ValidationFailure if the value was already seen """
+        if not self._checks_unique():
+            return None
+        if value in self.unique_values:
+            field, failure = self._duplicate(value)
+            self.invalid_dict["invalid_unique"][field].add(row_number)
+            return failure
+        self.unique_values[value] = row_number
+        return None
+
+    def _duplicate(self, value):
+        """ Return the value to report for a duplicated unicity value, and its failure """
+        return value, ValidationFailure(failures.DUPLICATE, value)
+
+    def _shard(self):
+        """ Return a copy of the validator, with empty failure & unicity state, to validate a shard of rows """
+        shard = copy(self)
+        shard.invalid_dict = {
+            "invalid_set": set(),
+            "invalid_rows": RowSet(),
+            "invalid_unique": defaultdict(RowSet)
+        }
+        shard.unique_values = self._new_unique_values()
+        return shard
+
+    def _merge(self, shard):
+        """
+        Merge the state of a shard (validating the next rows) into this validator.
+        Return the (row_number, error) of the shard values already seen in previous shards
+        """
+        self.invalid_dict["invalid_set"].update(shard.invalid_dict["invalid_set"])
+        self.invalid_dict["invalid_rows"].update(shard.invalid_dict["invalid_rows"])
+        for value, rows in shard.invalid_dict["invalid_unique"].items():
+            self.invalid_dict["invalid_unique"][value].update(rows)
+
+        duplicates = []
+        # First occurrences in the shard, in row order
+        shard_values = shard.unique_values.items()
+        shard.unique_values.close()
+        if not shard_values or not self._checks_unique():
+            return duplicates
+        seen_mask = self.unique_values.seen([value for value, row_number in shard_values])
+        for (value, row_number), is_seen in zip(shard_values, seen_mask.tolist()):
+            if is_seen:
+                field, failure = self._duplicate(value)
+                self.invalid_dict["invalid_unique"][field].add(row_number)
+                duplicates.append((row_number, failure))
+        self.unique_values.update(item for item, is_seen in zip(shard_values, seen_mask.tolist()) if not is_seen)
+        return duplicates
+
+    def _new_unique_values(self):
+        """ Return an empty store for the values already seen, using the unicity backend """
+        if self.unique_backend == "disk":
+            return DiskValues(self.unique_memory_limit if self.unique_memory_limit is not None else UNIQUE_MEMORY_LIMIT)
+        if self.unique_backend in (None, "memory"):
+            return MemoryValues()
+        raise BadValidatorException("unique_backend must be either 'memory' or 'disk'")
+
     def generate(self, column, column_name):
         """ Generate an openpyxl Datavalidation entity. Pass the column for custom formulas"""
         raise NotImplementedError
@@ -107,7 +514,7 @@ class Validator(object):
         """ Return a line of text describing allowed values"""
         raise NotImplementedError
 
-    def _set_attributes(self, empty_ok_template=False, ignore_case_template=False, ignore_space_template=False, na_ok_template=False, unique=False, skip_generation=False, skip_validation=False):
+    def _set_attributes(self, empty_ok_template=False, ignore_case_template=False, ignore_space_template=False, na_ok_template=False, unique=False, skip_generation=False, skip_validation=False, unique_backend="memory", unique_memory_limit=UNIQUE_MEMORY_LIMIT):
         # Override with template value if it was not set (default to None)
         if self.empty_ok is None:
             self.empty_ok = empty_ok_template
@@ -123,6 +530,13 @@ class Validator(object):
             self.skip_generation = skip_generation
         if self.skip_validation is None:
             self.skip_validation = skip_validation
+        if self.unique_backend is None or self.unique_memory_limit is None:
+            if self.unique_backend is None:
+                self.unique_backend = unique_backend
+            if self.unique_memory_limit is None:
+                self.unique_memory_limit = unique_memory_limit
+            if not len(self.unique_values):
+                self.unique_values = self._new_unique_values()
 
     def _format_formula(self, parameter_list, column):
         formula = ""
@@ -157,6 +571,9 @@ class NoValidator(Validator):
     def validate(self, field, row_number, row={}):
         pass
 
+    def validate_column(self, column, first_row, context, limit=None):
+        return numpy.zeros(len(column), dtype=bool), [], False
+
     def generate(self, column, column_name):
         return None
 
@@ -176,26 +593,14 @@ class TextValidator(Validator):
     def __init__(self, **kwargs):
         super(TextValidator, self).__init__(**kwargs)
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
-
+    def _check(self, field, row):
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
         if not field and not self._can_be_empty(row):
-            raise ValidationException(
-                "Field cannot be empty"
-            )
+            return ValidationFailure(failures.EMPTY)
 
-        if field and self.unique:
-            if field in self.unique_values:
-                self.invalid_dict["invalid_unique"][field].add(row_number)
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(field)
+        return field
 
     @property
     def bad(self):
@@ -228,44 +633,83 @@ class CastValidator(Validator):
         self.min = min
         self.max = max
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+    def _check_distinct_values(self, codes, distinct_values, limit):
+        # Number & text columns are checked at once with numpy masks, with the same verdicts as _check
+        kind = pandas.api.types.infer_dtype(distinct_values, skipna=False)
+        if kind in ("floating", "integer", "mixed-integer-float"):
+            fields = distinct_values
+            numbers = numpy.array(distinct_values, dtype=float)
+            not_numbers = numpy.zeros(len(fields), dtype=bool)
+            skipped = numpy.zeros(len(fields), dtype=bool)
+            row_dependent = skipped
+        elif kind == "string":
+            texts = pandas.Series(distinct_values, dtype=object)
+            if self.ignore_space:
+                texts = texts.str.strip()
+            fields = texts.tolist()
+            skipped, row_dependent = self._skipped_texts(texts)
+            numbers, not_numbers = _parse_floats(fields)
+            not_numbers &= ~(skipped | row_dependent)
+        else:
+            return super()._check_distinct_values(codes, distinct_values, limit)
+
+        checked = ~(skipped | row_dependent | not_numbers)
+        with numpy.errstate(invalid="ignore"):
+            not_integers = checked & ~(numpy.isfinite(numbers) & (numpy.trunc(numbers) == numbers)) if self.type == "whole" else numpy.zeros(len(fields), dtype=bool)
+            below = checked & ~not_integers & (numbers < self.min) if self.min is not None else numpy.zeros(len(fields), dtype=bool)
+            above = checked & ~not_integers & ~below & (numbers > self.max) if self.max is not None else numpy.zeros(len(fields), dtype=bool)
+
+        verdicts = numpy.empty(len(fields), dtype=object)
+        verdicts[:] = numbers.tolist()
+        verdicts[skipped] = None
+        verdicts[row_dependent] = _ROW_DEPENDENT
+        for index in numpy.flatnonzero(not_numbers).tolist():
+            verdicts[index] = ValidationFailure(failures.NOT_A_NUMBER, fields[index])
+        for index in numpy.flatnonzero(not_integers).tolist():
+            verdicts[index] = ValidationFailure(failures.NOT_AN_INTEGER, verdicts[index])
+        for index in numpy.flatnonzero(below).tolist():
+            verdicts[index] = ValidationFailure(failures.BELOW_MIN, verdicts[index], self.min)
+        for index in numpy.flatnonzero(above).tolist():
+            verdicts[index] = ValidationFailure(failures.ABOVE_MAX, verdicts[index], self.max)
+
+        return self._limit_verdicts(codes, verdicts, not_numbers | not_integers | below | above, limit)
+
+    def _check(self, field, row):
+        # Native numbers (spreadsheets read with native_types) are not parsed again
+        if _is_number(field):
+            return self._check_number(float(field))
+        if isinstance(field, (datetime.date, datetime.time)):
+            field = _as_text(field)
 
         if self.ignore_space:
             field = field.strip()
 
+        if not field and self._can_be_empty(row):
+            return None
+
+        if self.na_ok and str(field).lower() in ['na', 'n/a']:
+            return None
+
         try:
-            if field or not self._can_be_empty(row):
-                if self.na_ok and str(field).lower() in ['na', 'n/a']:
-                    return
-
-                field = float(field)
-                if self.type == "whole" and not (field).is_integer():
-                    raise ValueError
-
-                if self.min is not None and field < self.min:
-                    self.invalid_dict["invalid_set"].add(field)
-                    self.invalid_dict["invalid_rows"].add(row_number)
-                    raise ValidationException("{} is below min value {}".format(field, self.min))
-                if self.max is not None and field > self.max:
-                    self.invalid_dict["invalid_set"].add(field)
-                    self.invalid_dict["invalid_rows"].add(row_number)
-                    raise ValidationException("{} is above max value {}".format(field, self.max))
-
-                if field and self.unique:
-                    if field in self.unique_values:
-                        self.invalid_dict["invalid_unique"][field].add(row_number)
-                        raise ValidationException("'{}' is already in the column".format(field))
-                    self.unique_values.add(field)
-
-        except ValueError as e:
+            field = float(field)
+        except ValueError:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException(e)
+            return ValidationFailure(failures.NOT_A_NUMBER, field)
+        return self._check_number(field)
+
+    def _check_number(self, field):
+        if self.type == "whole" and not (field).is_integer():
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.NOT_AN_INTEGER, field)
+
+        if self.min is not None and field < self.min:
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.BELOW_MIN, field, self.min)
+        if self.max is not None and field > self.max:
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.ABOVE_MAX, field, self.max)
+
+        return field
 
     @property
     def bad(self):
@@ -345,13 +789,39 @@ class SetValidator(Validator):
         if self.na_ok:
             self.valid_values.add("N/A")
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
+    def _check_distinct_values(self, codes, distinct_values, limit):
+        # Text columns are normalized and checked at once (isin), with the same verdicts as _check
+        if pandas.api.types.infer_dtype(distinct_values, skipna=False) != "string":
+            return super()._check_distinct_values(codes, distinct_values, limit)
 
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+        fields = pandas.Series(distinct_values, dtype=object)
+        if self.ignore_case:
+            fields = fields.str.lower()
+        if self.ignore_space:
+            fields = fields.str.strip()
 
+        empty = (fields == "").to_numpy()
+        failed = numpy.zeros(len(fields), dtype=bool)
+        row_dependent = numpy.zeros(len(fields), dtype=bool)
+        if empty.any():
+            try:
+                failed = empty if not self._can_be_empty(_NO_ROW) else failed
+            except _RowNeeded:
+                row_dependent = empty
+        skipped = row_dependent | failed
+        if self.na_ok:
+            skipped |= fields.str.lower().isin(['na', 'n/a']).to_numpy() & ~failed
+        failed = failed | ~(skipped | fields.isin(self.valid_values).to_numpy())
+
+        verdicts = numpy.empty(len(fields), dtype=object)
+        verdicts[:] = fields.tolist()
+        verdicts[skipped | empty] = None
+        verdicts[row_dependent] = _ROW_DEPENDENT
+        for index in numpy.flatnonzero(failed).tolist():
+            verdicts[index] = ValidationFailure(failures.INVALID, fields[index])
+        return self._limit_verdicts(codes, verdicts, failed, limit)
+
+    def _check(self, field, row):
         if self.ignore_case:
             field = field.lower()
         if self.ignore_space:
@@ -359,28 +829,18 @@ class SetValidator(Validator):
 
         if not (field or self._can_be_empty(row)):
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException(
-                "'{}' is invalid".format(field)
-            )
+            return ValidationFailure(failures.INVALID, field)
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
         if str(field) not in self.valid_values:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException(
-                "'{}' is invalid".format(field)
-            )
-        if field and self.unique:
-            if str(field) in self.unique_values:
-                self.invalid_dict["invalid_unique"][field].add(row_number)
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(str(field))
+            return ValidationFailure(failures.INVALID, field)
+        return str(field) if field else None
 
-    def _set_attributes(self, empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template):
+    def _set_attributes(self, empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template, unique_backend_template="memory", unique_memory_limit_template=UNIQUE_MEMORY_LIMIT):
         # Override with template value if it was not set (default to None)
-        super()._set_attributes(empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template)
+        super()._set_attributes(empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template, unique_backend_template, unique_memory_limit_template)
 
         if self.empty_ok:
             self.valid_values.add("")
@@ -436,48 +896,44 @@ class LinkedSetValidator(Validator):
 
         self._clean_values()
 
+    @property
+    def context_columns(self):
+        return super().context_columns + [self.linked_column]
+
     def _precheck_unique_with(self, row):
         if self.linked_column not in row.keys():
             raise BadValidatorException("Linked column {} is not in file columns".format(self.linked_column))
         self.column_check = True
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
+    def _precheck(self, row):
+        super()._precheck(row)
+        if not self.column_check:
+            self._precheck_unique_with(row)
 
+    def _check(self, field, row):
         if self.ignore_case:
             field = field.lower()
         if self.ignore_space:
             field = field.strip()
 
-        if not self.column_check:
-            self._precheck_unique_with(row)
-
         if not field and self.empty_ok:
-            return
+            return None
 
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
         related_column_value = row[self.linked_column]
         if not related_column_value:
-            self.invalid_dict["invalid_rows"].add(row_number)
             self.invalid_dict["invalid_set"].add("Invalid linked column value: ''")
-            raise ValidationException("Linked column {} is empty".format(self.linked_column))
+            return ValidationFailure(failures.LINKED_EMPTY, self.linked_column)
         if related_column_value not in self.valid_values.keys():
             self.invalid_dict["invalid_set"].add("Invalid linked column value: {}".format(related_column_value))
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException("Linked column {} value {} is not in valid values".format(self.linked_column, related_column_value))
+            return ValidationFailure(failures.LINKED_INVALID, self.linked_column, related_column_value)
         if field not in self.valid_values[related_column_value]:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException("Value {} is not in allowed values".format(field))
+            return ValidationFailure(failures.NOT_ALLOWED, field)
 
-        if field and self.unique:
-            if field in self.unique_values:
-                self.invalid_dict["invalid_unique"][field].add(row_number)
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(field)
+        return field
 
     @property
     def bad(self):
@@ -514,9 +970,9 @@ class LinkedSetValidator(Validator):
             column_name += " ({})".format(self.readme)
         return "{} : Linked values to column {} {}{}".format(column_name, self.linked_column, "(required)" if not self.empty_ok else "", "(unique)" if self.unique else "")
 
-    def _set_attributes(self, empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template):
+    def _set_attributes(self, empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template, unique_backend_template="memory", unique_memory_limit_template=UNIQUE_MEMORY_LIMIT):
         # Override with template value if it was not set (default to None)
-        super()._set_attributes(empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template)
+        super()._set_attributes(empty_ok_template, ignore_case_template, ignore_space_template, na_ok_template, unique_template, skip_generation_template, skip_validation_template, unique_backend_template, unique_memory_limit_template)
         self._clean_values()
 
     def _clean_values(self):
@@ -538,9 +994,13 @@ class LinkedSetValidator(Validator):
 class DateValidator(Validator):
     """ Validates that a field is a Date """
 
-    def __init__(self, day_first=True, before=None, after=None, **kwargs):
+    def __init__(self, day_first=True, before=None, after=None, formats=None, **kwargs):
         super(DateValidator, self).__init__(**kwargs)
         self.day_first = day_first
+        # strptime formats tried (in order) on the whole column, before falling back to dateutil
+        self.formats = [formats] if isinstance(formats, str) else list(formats or [])
+        # Dates parsed with formats, by value, for the column being validated
+        self._parsed_dates = {}
 
         if before:
             try:
@@ -556,45 +1016,61 @@ class DateValidator(Validator):
 
         self.before = before
         self.after = after
+        # Bounds are only parsed once
+        self._before_date = parser.parse(before, dayfirst=day_first).date() if before else None
+        self._after_date = parser.parse(after, dayfirst=day_first).date() if after else None
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+    def _prepare(self, distinct_values):
+        self._parsed_dates = {}
+        if not self.formats:
+            return
+        remaining = pandas.Series([value.strip() if self.ignore_space else value for value in distinct_values if isinstance(value, str)], dtype=object)
+        for date_format in self.formats:
+            if remaining.empty:
+                break
+            dates = pandas.to_datetime(remaining, format=date_format, errors="coerce")
+            parsed = dates.notna().to_numpy()
+            self._parsed_dates.update(zip(remaining[parsed].tolist(), dates[parsed].dt.date.tolist()))
+            remaining = remaining[~parsed]
+
+    def _check(self, field, row):
+        # Native dates (spreadsheets read with native_types) are not parsed again
+        if isinstance(field, datetime.datetime) and field is not pandas.NaT:
+            return self._check_date(_as_text(field), field.date())
+        if isinstance(field, datetime.date):
+            return self._check_date(_as_text(field), field)
+        if _is_number(field) or isinstance(field, datetime.time):
+            field = _as_text(field)
 
         if self.ignore_space:
             field = field.strip()
 
-        try:
-            if field or not self._can_be_empty(row):
-                if self.na_ok and field.lower() in ['na', 'n/a']:
-                    return
-                # Pandas auto convert fields into dates (ignoring the parse_dates=False)
-                field = str(field)
-                date = parser.parse(field, dayfirst=self.day_first).date()
-
-                if self.before and not date < parser.parse(self.before, dayfirst=self.day_first).date():
-                    self.invalid_dict["invalid_set"].add(field)
-                    self.invalid_dict["invalid_rows"].add(row_number)
-                    raise ValidationException("Value {} is not before {}".format(field, self.before))
+        if not field and self._can_be_empty(row):
+            return None
 
-                if self.after and not date > parser.parse(self.after, dayfirst=self.day_first).date():
-                    self.invalid_dict["invalid_set"].add(field)
-                    self.invalid_dict["invalid_rows"].add(row_number)
-                    raise ValidationException("Value {} is not after {}".format(field, self.after))
+        if self.na_ok and field.lower() in ['na', 'n/a']:
+            return None
+        # Pandas auto convert fields into dates (ignoring the parse_dates=False)
+        field = str(field)
+        date = self._parsed_dates.get(field)
+        if date is None:
+            try:
+                date = parser.parse(field, dayfirst=self.day_first).date()
+            except parser.ParserError as e:
+                self.invalid_dict["invalid_set"].add(field)
+                return ValidationFailure(failures.LIBRARY_ERROR, e.with_traceback(None))
+        return self._check_date(field, date)
 
-                if field and self.unique:
-                    if field in self.unique_values:
-                        self.invalid_dict["invalid_unique"][field].add(row_number)
-                        raise ValidationException("'{}' is already in the column".format(field))
-                    self.unique_values.add(field)
+    def _check_date(self, field, date):
+        if self.before and not date < self._before_date:
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.NOT_BEFORE, field, self.before)
 
-        except parser.ParserError as e:
+        if self.after and not date > self._after_date:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException(e)
+            return ValidationFailure(failures.NOT_AFTER, field, self.after)
+
+        return field
 
     @property
     def bad(self):
@@ -666,44 +1142,80 @@ class TimeValidator(Validator):
 
         self.before = before
         self.after = after
-
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+        # Bounds are only parsed once
+        self._before_time = parser.parse(before).time() if before else None
+        self._after_time = parser.parse(after).time() if after else None
+        # Times parsed without dateutil, by value, for the column being validated
+        self._parsed_times = {}
+
+    def _prepare(self, distinct_values):
+        self._parsed_times = {}
+        texts = pandas.Series([_as_text(value) if _is_number(value) else value for value in distinct_values if isinstance(value, str) or _is_number(value)], dtype=object)
+        if texts.empty:
+            return
+        if self.ignore_space:
+            texts = texts.str.strip()
+
+        parts = texts.str.extract(_TIME_PATTERN)
+        hours = pandas.to_numeric(parts[0]).to_numpy()
+        minutes = pandas.to_numeric(parts[1]).to_numpy()
+        seconds = pandas.to_numeric(parts[2]).fillna(0).to_numpy()
+        fractions = pandas.to_numeric(parts[3].str.ljust(6, "0")).fillna(0).to_numpy()
+        with numpy.errstate(invalid="ignore"):
+            clock = (hours < 24) & (minutes < 60) & (seconds < 60)
+            microseconds = ((hours * 60 + minutes) * 60 + seconds) * 10**6 + fractions
+
+            # Excel stores times as fractions of a day
+            days = pandas.to_numeric(texts.where(parts[0].isna()), errors="coerce").to_numpy(dtype=float)
+            day_microseconds = numpy.rint(days * _MICROSECONDS_PER_DAY)
+            day_fraction = (days >= 0) & (day_microseconds < _MICROSECONDS_PER_DAY)
+
+        microseconds = numpy.where(day_fraction, day_microseconds, microseconds)
+        parsed = clock | day_fraction
+        for text, value in zip(texts[parsed].tolist(), microseconds[parsed].astype(numpy.int64).tolist()):
+            value, microsecond = divmod(value, 10**6)
+            value, second = divmod(value, 60)
+            hour, minute = divmod(value, 60)
+            self._parsed_times[text] = datetime.time(hour, minute, second, microsecond)
+
+    def _check(self, field, row):
+        # Native times (spreadsheets read with native_types) are not parsed again
+        if isinstance(field, datetime.time):
+            return self._check_time(_as_text(field), field)
+        if isinstance(field, datetime.datetime) and field is not pandas.NaT:
+            return self._check_time(_as_text(field), field.time())
+        if _is_number(field) or isinstance(field, datetime.date):
+            field = _as_text(field)
 
         if self.ignore_space:
             field = field.strip()
-        try:
-            if field or not self._can_be_empty(row):
-                if self.na_ok and field.lower() in ['na', 'n/a']:
-                    return
-                # Pandas auto convert fields into dates (ignoring the parse_dates=False)
-                field = str(field)
-                time = parser.parse(field).time()
 
-                if self.before and not time < parser.parse(self.before).time():
-                    self.invalid_dict["invalid_set"].add(field)
-                    self.invalid_dict["invalid_rows"].add(row_number)
-                    raise ValidationException("Value {} is not before {}".format(field, self.before))
+        if not field and self._can_be_empty(row):
+            return None
 
-                if self.after and not time > parser.parse(self.after).time():
-                    self.invalid_dict["invalid_set"].add(field)
-                    self.invalid_dict["invalid_rows"].add(row_number)
-                    raise ValidationException("Value {} is not after {}".format(field, self.after))
+        if self.na_ok and field.lower() in ['na', 'n/a']:
+            return None
+        # Pandas auto convert fields into dates (ignoring the parse_dates=False)
+        field = str(field)
+        time = self._parsed_times.get(field)
+        if time is None:
+            try:
+                time = parser.parse(field).time()
+            except parser.ParserError as e:
+                self.invalid_dict["invalid_set"].add(field)
+                return ValidationFailure(failures.LIBRARY_ERROR, e.with_traceback(None))
+        return self._check_time(field, time)
 
-                if field and self.unique:
-                    if field in self.unique_values:
-                        self.invalid_dict["invalid_unique"][field].add(row_number)
-                        raise ValidationException("'{}' is already in the column".format(field))
-                    self.unique_values.add(field)
+    def _check_time(self, field, time):
+        if self.before and not time < self._before_time:
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.NOT_BEFORE, field, self.before)
 
-        except parser.ParserError as e:
+        if self.after and not time > self._after_time:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException(e)
+            return ValidationFailure(failures.NOT_AFTER, field, self.after)
+
+        return field
 
     @property
     def bad(self):
@@ -718,9 +1230,9 @@ class TimeValidator(Validator):
 
         formulas.append("IsNumber({}2)".format(column))
         if self.before is not None:
-            formulas.append('{}2<=TIMEVALUE("{}")'.format(column, parser.parse(self.before).time()))
+            formulas.append('{}2<=TIMEVALUE("{}")'.format(column, self._before_time))
         if self.after is not None:
-            formulas.append('{}2>=TIMEVALUE("{}")'.format(column, parser.parse(self.after).time()))
+            formulas.append('{}2>=TIMEVALUE("{}")'.format(column, self._after_time))
 
         formula = self._format_formula(formulas, column)
         params['formula1'] = formula
@@ -752,32 +1264,48 @@ class TimeValidator(Validator):
 class EmailValidator(Validator):
     """ Validates that a field is in the given set """
 
-    def __init__(self, **kwargs):
+    def __init__(self, check_deliverability=False, **kwargs):
         super(EmailValidator, self).__init__(**kwargs)
+        self.check_deliverability = check_deliverability
+        # Verdict of each domain (None, or the error): domains are only checked (and resolved) once
+        self._domains = {}
+
+    def _check_domain(self, domain):
+        """ Return the error of the domain (or None), checked (with its deliverability if needed) on first use """
+        key = domain.lower()
+        if key not in self._domains:
+            try:
+                validate_email("a@{}".format(domain), check_deliverability=self.check_deliverability)
+                self._domains[key] = None
+            except EmailNotValidError as e:
+                self._domains[key] = e.with_traceback(None)
+        return self._domains[key]
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
+    def _check(self, field, row):
+        if self.ignore_space:
+            field = field.strip()
+
+        if not field and self._can_be_empty(row):
             return None
 
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+        if self.na_ok and field.lower() in ['na', 'n/a']:
+            return None
 
-        if self.ignore_space:
-            field = field.strip()
-        if field or not self._can_be_empty(row):
-            if self.na_ok and field.lower() in ['na', 'n/a']:
-                return
-            try:
-                validate_email(field)
-            except EmailNotValidError as e:
-                self.invalid_dict["invalid_set"].add(field)
-                self.invalid_dict["invalid_rows"].add(row_number)
-                raise ValidationException(e)
-            if self.unique:
-                if field in self.unique_values:
-                    self.invalid_dict["invalid_unique"][field].add(row_number)
-                    raise ValidationException("'{}' is already in the column".format(field))
-                self.unique_values.add(field)
+        # Fast path: simple local part, and a domain already known to be valid
+        local_part, at, domain = field.rpartition("@")
+        if at and len(local_part) <= _EMAIL_LOCAL_PART_LENGTH and len(field) <= _EMAIL_LENGTH and _EMAIL_LOCAL_PART.fullmatch(local_part) and self._check_domain(domain) is None:
+            return field
+
+        try:
+            validated = validate_email(field, check_deliverability=False)
+        except EmailNotValidError as e:
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.LIBRARY_ERROR, e.with_traceback(None))
+        error = self._check_domain(validated.ascii_domain) if self.check_deliverability else None
+        if error:
+            self.invalid_dict["invalid_set"].add(field)
+            return ValidationFailure(failures.LIBRARY_ERROR, error)
+        return field
 
     @property
     def bad(self):
@@ -801,6 +1329,10 @@ class EmailValidator(Validator):
             column_name += " ({})".format(self.readme)
         return "{} : Email {}{}".format(column_name, "(required)" if not self.empty_ok else "", "(unique)" if self.unique else "")
 
+    def _merge(self, shard):
+        self._domains.update(shard._domains)
+        return super()._merge(shard)
+
 
 class OntologyValidator(Validator):
     """ Validates that a field is in the given set """
@@ -818,13 +1350,7 @@ class OntologyValidator(Validator):
         if self.root_term and not self.root_term_iri:
             raise BadValidatorException("'{}' is not a valid root term for ontology {}".format(self.root_term, self.ontology))
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
-
+    def _check(self, field, row):
         if self.ignore_space:
             field = field.strip()
 
@@ -832,26 +1358,21 @@ class OntologyValidator(Validator):
             field = field.lower()
 
         if field == "" and self._can_be_empty(row):
-            return
+            return None
 
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
         if field in self.invalid_dict["invalid_set"]:
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException("{} is not an ontological term".format(field))
+            return ValidationFailure(failures.NOT_ONTOLOGICAL, field)
 
         if field not in self.validated_terms:
             ontological_term = self._validate_ontological_term(field)
             if not ontological_term:
                 self.invalid_dict["invalid_set"].add(field)
-                self.invalid_dict["invalid_rows"].add(row_number)
-                raise ValidationException("{} is not an ontological term".format(field))
+                return ValidationFailure(failures.NOT_ONTOLOGICAL, field)
             self.validated_terms.add(field)
-        if field and self.unique:
-            if field in self.unique_values:
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(field)
+        return field
 
     @property
     def bad(self):
@@ -892,6 +1413,10 @@ class OntologyValidator(Validator):
             text += " (unique)"
         return text
 
+    def _merge(self, shard):
+        self.validated_terms.update(shard.validated_terms)
+        return super()._merge(shard)
+
     def _validate_ontological_term(self, term, return_uri=False):
         base_path = "http://www.ebi.ac.uk/ols/api/search"
         body = {
@@ -951,25 +1476,61 @@ class UniqueValidator(Validator):
 
     def __init__(self, unique_with=[], **kwargs):
         super(UniqueValidator, self).__init__(**kwargs)
-        self.unique_values = set()
         self.unique_with = unique_with
         self.unique_check = False
         # Disable this value just in case
         self.unique = False
 
+    @property
+    def context_columns(self):
+        return super().context_columns + list(self.unique_with)
+
     def _precheck_unique_with(self, row):
         extra = set(self.unique_with) - set(row.keys())
         if extra:
             raise BadValidatorException(extra)
         self.unique_check = True
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+    def _precheck(self, row):
+        super()._precheck(row)
+        if self.unique_with and not self.unique_check:
+            self._precheck_unique_with(row)
 
+    def _normalized(self, fields):
+        """ Normalize a Series of values as _check does """
+        if self.ignore_space:
+            fields = fields.str.strip()
+        if self.ignore_case:
+            fields = fields.str.lower()
+        return fields
+
+    def _check_distinct_values(self, codes, distinct_values, limit):
+        # Text columns are checked at once (unless empty values depend on the row), with the same verdicts as _check
+        if self.empty_ok_if or self.empty_ok_unless or pandas.api.types.infer_dtype(distinct_values, skipna=False) != "string":
+            return super()._check_distinct_values(codes, distinct_values, limit)
+
+        fields = self._normalized(pandas.Series(distinct_values, dtype=object))
+        empty = (fields == "").to_numpy()
+        failed = empty & (not self._can_be_empty(_NO_ROW))
+        skipped = empty & ~failed
+        if self.na_ok:
+            skipped |= fields.str.lower().isin(['na', 'n/a']).to_numpy()
+
+        verdicts = numpy.empty(len(fields), dtype=object)
+        # The other columns of the key are in the row
+        verdicts[:] = _ROW_DEPENDENT if self.unique_with else list(zip(fields.tolist()))
+        verdicts[skipped] = None
+        for index in numpy.flatnonzero(failed).tolist():
+            verdicts[index] = ValidationFailure(failures.EMPTY)
+        return self._limit_verdicts(codes, verdicts, failed, limit, reported=fields.tolist())
+
+    def _check_rows(self, fields, rows):
+        # Without empty_ok_if / empty_ok_unless, only the keys (from non-empty values) depend on the rows
+        if self.empty_ok_if or self.empty_ok_unless or pandas.api.types.infer_dtype(fields, skipna=False) != "string":
+            return super()._check_rows(fields, rows)
+        return list(zip(self._normalized(pandas.Series(fields, dtype=object)).tolist(), *[rows[col] for col in self.unique_with]))
+
+    def _check(self, field, row):
         if self.ignore_space:
             field = field.strip()
 
@@ -978,33 +1539,25 @@ class UniqueValidator(Validator):
 
         if not field:
             if self._can_be_empty(row):
-                return
+                return None
             else:
                 self.invalid_dict["invalid_set"].add(field)
-                self.invalid_dict["invalid_rows"].add(row_number)
-                raise ValidationException(
-                    "Field cannot be empty"
-                )
+                return ValidationFailure(failures.EMPTY)
 
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
-        if self.unique_with and not self.unique_check:
-            self._precheck_unique_with(row)
+        return tuple([field] + [row[k] for k in self.unique_with])
 
-        key = tuple([field] + [row[k] for k in self.unique_with])
-        if key not in self.unique_values:
-            self.unique_values.add(key)
-        else:
-            self.invalid_dict["invalid_unique"][field].add(row_number)
-            if self.unique_with:
-                raise ValidationException(
-                    "'{}' is already in the column (unique with: {})".format(
-                        field, key[1:]
-                    )
-                )
-            else:
-                raise ValidationException("'{}' is already in the column".format(field))
+    def _checks_unique(self):
+        # The 'unique' attribute is disabled: unicity is the point of this validator
+        return True
+
+    def _duplicate(self, key):
+        field = key[0]
+        if self.unique_with:
+            return field, ValidationFailure(failures.DUPLICATE_WITH, field, key[1:])
+        return field, ValidationFailure(failures.DUPLICATE, field)
 
     @property
     def bad(self):
@@ -1066,13 +1619,7 @@ class VocabulaireOuvertValidator(Validator):
             if not exists:
                 raise BadValidatorException("'{}' is not a valid root term. Make sure it is a concept, and not a microthesaurus or group".format(self.root_term))
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
-
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
-
+    def _check(self, field, row):
         if self.ignore_space:
             field = field.strip()
 
@@ -1080,28 +1627,22 @@ class VocabulaireOuvertValidator(Validator):
             field = field.lower()
 
         if field == "" and self._can_be_empty(row):
-            return
+            return None
 
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
         if field in self.invalid_dict["invalid_set"]:
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException("{} is not an ontological term".format(field))
+            return ValidationFailure(failures.NOT_ONTOLOGICAL, field)
 
         if field not in self.validated_terms:
             ontological_term, _ = self._validate_vo_term(field)
             if not ontological_term:
                 self.invalid_dict["invalid_set"].add(field)
-                self.invalid_dict["invalid_rows"].add(row_number)
-                raise ValidationException("{} is not an ontological term".format(field))
+                return ValidationFailure(failures.NOT_ONTOLOGICAL, field)
             self.validated_terms.add(field)
 
-        if field and self.unique:
-            if field in self.unique_values:
-                self.invalid_dict["invalid_unique"][field].add(row_number)
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(field)
+        return field
 
     @property
     def bad(self):
@@ -1156,6 +1697,10 @@ class VocabulaireOuvertValidator(Validator):
             text += " (unique)"
         return text
 
+    def _merge(self, shard):
+        self.validated_terms.update(shard.validated_terms)
+        return super()._merge(shard)
+
     def _validate_vo_term(self, field, return_uri=False):
         params = {"query": field, "unique": True, "type": "skos:Concept"}
         if self.root_term_iri:
@@ -1213,17 +1758,26 @@ class RegexValidator(Validator):
         self.regex = regex
         self.excel_formula = excel_formula
         try:
-            re.compile(regex)
+            self._pattern = re.compile(regex)
         except re.error:
             raise BadValidatorException("'{}' is not a valid regular expression".format(self.regex))
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
+    def _check_distinct_values(self, codes, distinct_values, limit):
+        # Text columns are matched at once, with the same verdicts as _check (exactly one match of the regex)
+        if pandas.api.types.infer_dtype(distinct_values, skipna=False) != "string":
+            return super()._check_distinct_values(codes, distinct_values, limit)
 
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+        fields = pandas.Series(distinct_values, dtype=object)
+        if self.ignore_space:
+            fields = fields.str.strip()
+        if self.ignore_case:
+            fields = fields.str.lower()
+        skipped, row_dependent = self._skipped_texts(fields)
+        failed = ~(skipped | row_dependent) & (fields.str.count(self._pattern) != 1).to_numpy()
+        verdicts = self._text_verdicts(fields, skipped, row_dependent, failed, lambda field: ValidationFailure(failures.NO_REGEX_MATCH, field, self.regex))
+        return self._limit_verdicts(codes, verdicts, failed, limit)
 
+    def _check(self, field, row):
         if self.ignore_space:
             field = field.strip()
 
@@ -1231,22 +1785,17 @@ class RegexValidator(Validator):
             field = field.lower()
 
         if field == "" and self._can_be_empty(row):
-            return
+            return None
 
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
+            return None
 
-        matches = re.findall(self.regex, field)
+        matches = self._pattern.findall(field)
         if not len(matches) == 1:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException("{} does not match regex {}".format(field, self.regex))
+            return ValidationFailure(failures.NO_REGEX_MATCH, field, self.regex)
 
-        if field and self.unique:
-            if field in self.unique_values:
-                self.invalid_dict["invalid_unique"][field].add(row_number)
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(field)
+        return field
 
     @property
     def bad(self):
@@ -1286,6 +1835,25 @@ class RegexValidator(Validator):
         return text
 
 
+def _gps_regex(format, only_long, only_lat):
+    """ Regex matching the GPS coordinates of the given format """
+    if format == "DD":
+        regex_lat = r"[-+]?((90(\.0+)?)|([1-8]?\d(\.\d+)?))[NSns]?"
+        regex_long = r"[-+]?((180(\.0+)?)|(((1[0-7]\d)|([1-9]?\d))(\.\d+)?))[wWeE]?"
+
+    else:
+        regex_lat = r"((([1-8]?\d)(°\s?|\s)([1-5]?\d|60)('\s?|\s)?([1-5]?\d(\.\d+)?|60)(\"\s?|\s)?)|(90(°\s?|\s)0('\s?|\s)0(\"\s?|\s)?))[NSns]?"
+        regex_long = r"((((1[0-7][0-9])|([0-9]{1,2}))(°\s?|\s)([1-5]?\d|60)('\s?|\s)([1-5]?\d(\.\d+)?|60)(\"\s?|\s)?)|(180(°\s?|\s)0('\s?|\s)0(\"\s?|\s)?))[EWew]?"
+
+    if only_long:
+        regex = r"^{}$".format(regex_long)
+    elif only_lat:
+        regex = r"^{}$".format(regex_lat)
+    else:
+        regex = r"^{}[,\s]?\s?{}$".format(regex_lat, regex_long)
+    return regex
+
+
 class GPSValidator(Validator):
     """ Validates that a term match a regex"""
 
@@ -1301,48 +1869,36 @@ class GPSValidator(Validator):
 
         self.only_long = only_long
         self.only_lat = only_lat
+        self._pattern = re.compile(_gps_regex(format, only_long, only_lat))
 
-    def validate(self, field, row_number, row):
-        if self.skip_validation:
-            return None
+    def _check_distinct_values(self, codes, distinct_values, limit):
+        # Text columns are matched at once, with the same verdicts as _check (the pattern is anchored)
+        if pandas.api.types.infer_dtype(distinct_values, skipna=False) != "string":
+            return super()._check_distinct_values(codes, distinct_values, limit)
 
-        if not self.empty_check:
-            self._precheck_empty_ok_if(row)
+        fields = pandas.Series(distinct_values, dtype=object)
+        if self.ignore_space:
+            fields = fields.str.strip()
+        skipped, row_dependent = self._skipped_texts(fields)
+        failed = ~(skipped | row_dependent | fields.str.match(self._pattern).to_numpy(dtype=bool))
+        verdicts = self._text_verdicts(fields, skipped, row_dependent, failed, lambda field: ValidationFailure(failures.NOT_GPS, field))
+        return self._limit_verdicts(codes, verdicts, failed, limit)
 
+    def _check(self, field, row):
         if self.ignore_space:
             field = field.strip()
 
         if field == "" and self._can_be_empty(row):
-            return
+            return None
 
         if self.na_ok and field.lower() in ['na', 'n/a']:
-            return
-
-        if self.format == "DD":
-            regex_lat = r"[-+]?((90(\.0+)?)|([1-8]?\d(\.\d+)?))[NSns]?"
-            regex_long = r"[-+]?((180(\.0+)?)|(((1[0-7]\d)|([1-9]?\d))(\.\d+)?))[wWeE]?"
-
-        else:
-            regex_lat = r"((([1-8]?\d)(°\s?|\s)([1-5]?\d|60)('\s?|\s)?([1-5]?\d(\.\d+)?|60)(\"\s?|\s)?)|(90(°\s?|\s)0('\s?|\s)0(\"\s?|\s)?))[NSns]?"
-            regex_long = r"((((1[0-7][0-9])|([0-9]{1,2}))(°\s?|\s)([1-5]?\d|60)('\s?|\s)([1-5]?\d(\.\d+)?|60)(\"\s?|\s)?)|(180(°\s?|\s)0('\s?|\s)0(\"\s?|\s)?))[EWew]?"
-
-        if self.only_long:
-            regex = r"^{}$".format(regex_long)
-        elif self.only_lat:
-            regex = r"^{}$".format(regex_lat)
-        else:
-            regex = r"^{}[,\s]?\s?{}$".format(regex_lat, regex_long)
+            return None
 
-        matches = re.findall(regex, field)
+        matches = self._pattern.findall(field)
         if not len(matches) == 1:
             self.invalid_dict["invalid_set"].add(field)
-            self.invalid_dict["invalid_rows"].add(row_number)
-            raise ValidationException("{} is not a valid GPS coordinate")
-        if field and self.unique:
-            if field in self.unique_values:
-                self.invalid_dict["invalid_unique"][field].add(row_number)
-                raise ValidationException("'{}' is already in the column".format(field))
-            self.unique_values.add(field)
+            return ValidationFailure(failures.NOT_GPS, field)
+        return field
 
     @property
     def bad(self):
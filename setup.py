@@ -11,6 +11,7 @@ setup(
     author_email="mateo.boudet@inrae.fr",
     url="https://github.com/genouest/checkcel",
     install_requires=requires,
+    extras_require={"arrow": ["pyarrow"]},
     packages=find_packages(),
     long_description_content_type="text/markdown",
     license='MIT',
@@ -1,6 +1,15 @@
+import datetime
 import pandas as pd
+import pytest
+import zipfile
+from dateutil import parser
+from email_validator import EmailUndeliverableError
+from openpyxl import Workbook
 
 from checkcel import Checkcel
+from checkcel import readers
+from checkcel import validators as validators_module
+from checkcel.exceptions import BadValidatorException, ValidationException
 from checkcel.validators import TextValidator, DateValidator, UniqueValidator, SetValidator, LinkedSetValidator, IntValidator, FloatValidator, GPSValidator, EmailValidator, TimeValidator, NoValidator, RegexValidator
 
 
@@ -26,6 +35,68 @@ class TestCheckcelClass():
         assert len(validation.logs) == 2
         assert validation.logs[1] == "Error: Length issue: Expecting 2 row(s), found 1"
 
+    def test_failure_rows(self):
+        data = {'my_column': ['valid', '', 'valid', ''], 'another_column': ['1', '2', 'x', '4']}
+        validators = {'my_column': TextValidator(), 'another_column': IntValidator()}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [2, 4]
+        assert list(validation.failures['another_column'].keys()) == [3]
+        assert validation.validators['another_column'].bad['invalid_rows'] == {3}
+
+    def test_failure_messages(self):
+        data = {'my_column': ['4.5', 'x', '12', '4', '4']}
+        validators = {'my_column': IntValidator(max=10, unique=True)}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        val = validation.validate()
+        assert val is False
+        failures = validation.failures['my_column']
+        assert all(isinstance(error, ValidationException) for errors in failures.values() for error in errors)
+        assert [str(errors[0]) for errors in failures.values()] == [
+            "4.5 is not an integer",
+            "could not convert string to float: 'x'",
+            "12.0 is above max value 10",
+            "'4.0' is already in the column"
+        ]
+
+    def test_failure_store(self):
+        data = {'my_column': ['x', 'a', 'x', 'b', 'x'] * 1000}
+        validators = {'my_column': SetValidator(valid_values=['a', 'b'])}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        val = validation.validate()
+        assert val is False
+        failures = validation.failures['my_column']
+        assert len(failures) == 3000
+        assert 1 in failures and 2 not in failures
+        assert str(failures[5][0]) == "'x' is invalid"
+        assert 'other_column' not in validation.failures
+        assert len(validation.failures['other_column']) == 0
+        assert list(validators['my_column'].bad['invalid_rows'])[:3] == [1, 3, 5]
+
+    def test_distinct_values_checked_once(self, monkeypatch):
+        checked = []
+        check = DateValidator._check
+
+        def counting_check(self, field, row):
+            checked.append(field)
+            return check(self, field, row)
+
+        monkeypatch.setattr(DateValidator, "_check", counting_check)
+        data = {'my_column': ['01/01/2000', '02/01/2000', '01/01/2000', 'c', '01/01/2000', '02/01/2000'] * 100}
+        validators = {'my_column': DateValidator(unique=True)}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert sorted(checked) == ['01/01/2000', '02/01/2000', 'c']
+        assert len(validation.failures['my_column']) == 598
+        assert validation.validators['my_column'].bad['invalid_rows'] == set(range(4, 601, 6))
+        assert validation.validators['my_column'].bad['invalid_unique']['01/01/2000'] == set(range(3, 601, 2))
+
 
 class TestCheckcelValidateText():
 
@@ -132,6 +203,17 @@ class TestCheckcelValidateFloat():
         val = Checkcel(data=df, validators=validators)
         assert val.validate()
 
+    def test_unique_nan(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column\n1\nnan\n2\nnan\n1.0\n3\n")
+        # NaN values are not duplicates of each other, whether the file is checked at once, in chunks or row by row
+        for options in [{}, {'chunksize': 2}, {'max_failures': 10}]:
+            validators = {'my_column': FloatValidator(unique=True)}
+            validation = Checkcel(source=str(source), format="tabular", validators=validators, **options)
+            val = validation.validate()
+            assert val is False
+            assert list(validation.failures['my_column'].keys()) == [5]
+
 
 class TestCheckcelValidateInt():
 
@@ -213,6 +295,24 @@ class TestCheckcelValidateInt():
         assert val.validate()
 
 
+    def test_invalid_mixed(self):
+        data = {'my_column': [' 4 ', 'na', '', '4.0', '2.5', 'nan', '12', '-1', 'x']}
+        validators = {'my_column': IntValidator(min=0, max=10, unique=True, na_ok=True, ignore_space=True)}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, empty_ok=True, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [4, 5, 6, 7, 8, 9]
+        assert str(validation.failures['my_column'][4][0]) == "'4.0' is already in the column"
+
+    def test_valid_numbers(self):
+        data = {'my_column': [6.0, 4.0, 2.0]}
+        validators = {'my_column': IntValidator(min=2, unique=True)}
+        df = pd.DataFrame.from_dict(data)
+        val = Checkcel(data=df, validators=validators)
+        assert val.validate()
+
+
 class TestCheckcelValidateMail():
 
     def test_invalid(self):
@@ -257,6 +357,29 @@ class TestCheckcelValidateMail():
         assert val.validate()
 
 
+    def test_invalid_deliverability(self, monkeypatch):
+        resolved = []
+        validate_email = validators_module.validate_email
+
+        def offline_validate_email(email, check_deliverability=False):
+            validated = validate_email(email, check_deliverability=False)
+            if check_deliverability:
+                resolved.append(validated.ascii_domain)
+                if validated.ascii_domain == "unknownprovider.com":
+                    raise EmailUndeliverableError("The domain name unknownprovider.com does not exist.")
+            return validated
+
+        monkeypatch.setattr(validators_module, "validate_email", offline_validate_email)
+        data = {'my_column': ['valid@emailprovider.com', 'valid2@emailprovider.com', 'first.last@unknownprovider.com', '"quoted"@unknownprovider.com']}
+        validators = {'my_column': EmailValidator(check_deliverability=True)}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [3, 4]
+        assert resolved == ["emailprovider.com", "unknownprovider.com"]
+
+
 class TestCheckcelValidateDate():
 
     def test_invalid(self):
@@ -318,6 +441,23 @@ class TestCheckcelValidateDate():
         val = Checkcel(data=df, validators=validators)
         assert val.validate()
 
+    def test_valid_formats(self):
+        data = {'my_column': ['01/02/1970', '1970-02-01', '1 Feb 1970', ' 01/02/1970 ']}
+        validators = {'my_column': DateValidator(formats=["%d/%m/%Y", "%Y-%m-%d"], before="02/02/1970", after="31/01/1970")}
+        df = pd.DataFrame.from_dict(data)
+        val = Checkcel(data=df, validators=validators)
+        assert val.validate()
+
+    def test_invalid_formats(self):
+        data = {'my_column': ['01/02/1970', '1970-02-01', 'thisisnotadate', '01/02/1980']}
+        validators = {'my_column': DateValidator(formats="%d/%m/%Y", before="01/01/1975")}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, empty_ok=False, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert len(validation.failures['my_column']) == 2
+        assert str(validation.failures['my_column'][4][0]) == "Value 01/02/1980 is not before 01/01/1975"
+
 
 class TestCheckcelValidateTime():
 
@@ -380,6 +520,23 @@ class TestCheckcelValidateTime():
         val = Checkcel(data=df, validators=validators)
         assert val.validate()
 
+    def test_valid_clock_and_fraction(self):
+        data = {'my_column': ['9:05', '12:30:15.5', '0.5', '0.25']}
+        validators = {'my_column': TimeValidator(after="05:00", before="13:00")}
+        df = pd.DataFrame.from_dict(data)
+        val = Checkcel(data=df, validators=validators)
+        assert val.validate()
+
+    def test_invalid_clock_and_fraction(self):
+        data = {'my_column': ['25:00', '12:60', '0.75', '1.5', '12:00']}
+        validators = {'my_column': TimeValidator(before="13:00", after="11:00")}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, empty_ok=False, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [1, 2, 3, 4]
+        assert str(validation.failures['my_column'][3][0]) == "Value 0.75 is not before 13:00"
+
 
 class TestCheckcelValidateUnique():
 
@@ -431,6 +588,47 @@ class TestCheckcelValidateUnique():
         val = Checkcel(data=df, validators=validators)
         assert val.validate()
 
+    def test_invalid_unique_rows(self):
+        data = {'my_column': ['a', 'A ', 'b', 'a', 'a', 'b'], 'another_column': ['1', '1', '1', '2', '1', '1']}
+        validators = {'my_column': UniqueValidator(unique_with=["another_column"], ignore_case=True, ignore_space=True), 'another_column': NoValidator()}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [2, 5, 6]
+        assert str(validation.failures['my_column'][6][0]) == "'b' is already in the column (unique with: ('1',))"
+        assert validation.validators['my_column'].bad['invalid_unique'] == {'a': {2, 5}, 'b': {6}}
+
+    def test_invalid_disk_backend(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column\na,1\nb,1\nc,2\na,2\nb,1\nd,1\na,1\n")
+        for chunksize in [None, 2]:
+            # Values are spilled to disk after each chunk
+            validators = {'my_column': UniqueValidator(unique_with=["another_column"], unique_memory_limit=0.0001), 'another_column': TextValidator(unique=True)}
+            validation = Checkcel(source=str(source), format="tabular", chunksize=chunksize, unique_backend="disk", validators=validators)
+            val = validation.validate()
+            assert val is False
+            assert list(validation.failures['my_column'].keys()) == [5, 7]
+            assert list(validation.failures['another_column'].keys()) == [2, 4, 5, 6, 7]
+            assert validation.validators['my_column'].bad['invalid_unique'] == {'b': {5}, 'a': {7}}
+
+    def test_disk_backend_same_as_memory(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column\n1\nnan\n2\nnan\n1.0\n3\n")
+        for options in [{}, {'chunksize': 2}, {'jobs': 2, 'parallel': 'rows'}]:
+            results = []
+            for backend in ["memory", "disk"]:
+                # Every value is spilled to disk
+                validators = {'my_column': FloatValidator(unique=True)}
+                validation = Checkcel(source=str(source), format="tabular", unique_backend=backend, unique_memory_limit=0, validators=validators, **options)
+                assert validation.validate() is False
+                results.append({row: [str(error) for error in errors] for row, errors in validation.failures['my_column'].items()})
+            assert results[0] == results[1] == {5: ["'1.0' is already in the column"]}
+
+    def test_invalid_backend(self):
+        with pytest.raises(BadValidatorException):
+            UniqueValidator(unique_backend="cloud")
+
 
 class TestCheckcelValidateSet():
 
@@ -535,6 +733,27 @@ class TestCheckcelValidateLinkedSet():
         assert val.validate()
 
 
+    def test_pairs_checked_once(self, monkeypatch):
+        checked = []
+        check = LinkedSetValidator._check
+
+        def counting_check(self, field, row):
+            checked.append((row['my_column'], field))
+            return check(self, field, row)
+
+        monkeypatch.setattr(LinkedSetValidator, "_check", counting_check)
+        data = {'my_column': ['value_1', 'value_2', 'value_1', 'value_2'] * 50, "another_column": ["valid_value", "another_valid_value", "another_valid_value", "another_valid_value"] * 50}
+        validators = {
+            'my_column': SetValidator(valid_values=['value_1', 'value_2']),
+            'another_column': LinkedSetValidator(linked_column="my_column", valid_values={"value_1": ["valid_value"], "value_2": ["another_valid_value"]})
+        }
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, validators=validators)
+        assert validation.validate() is False
+        assert checked == [("value_1", "valid_value"), ("value_2", "another_valid_value"), ("value_1", "another_valid_value")]
+        assert list(validation.failures['another_column'].keys()) == list(range(3, 201, 4))
+
+
 class TestCheckcelValidateGPS():
 
     def test_invalid_dd(self):
@@ -652,6 +871,16 @@ class TestCheckcelValidateRegex():
         assert val.validate()
 
 
+    def test_invalid_several_matches(self):
+        data = {'my_column': ['AFX1', 'AFX1 AFX2', ' afx3 ', 'NA']}
+        validators = {'my_column': RegexValidator(regex="AFX\\d", ignore_space=True, na_ok=True)}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, empty_ok=False, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [2, 3]
+
+
 class TestCheckcelValidateEmpty_if():
 
     def test_invalid_string(self):
@@ -730,3 +959,600 @@ class TestCheckcelValidateEmpty_unless():
         val = validation.validate()
         assert val is False
         assert len(validation.failures['another_column']) == 1
+
+
+class TestCheckcelChunks():
+
+    def test_invalid_chunks(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column\nvalue1,1\nvalue2,x\nvalue1,3\nvalue4,4\nvalue1,5\n")
+        validators = {'my_column': TextValidator(unique=True), 'another_column': IntValidator()}
+        validation = Checkcel(source=str(source), format="tabular", chunksize=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [3, 5]
+        assert list(validation.failures['another_column'].keys()) == [2]
+        assert validation.validators['my_column'].bad['invalid_unique'] == {'value1': {3, 5}}
+
+    def test_csv_strings(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column\nNA,1.50\n,2\nvalue,\n")
+        validators = {'my_column': TextValidator(na_ok=True), 'another_column': SetValidator(valid_values=['1.50', '2'])}
+        validation = Checkcel(source=str(source), format="tabular", validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [2]
+        assert list(validation.failures['another_column'].keys()) == [3]
+
+    def test_csv_arrow(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column\nNA,1.50\n,2\nvalue,\nNA,2\n")
+        for chunksize in [None, 3]:
+            validators = {'my_column': TextValidator(na_ok=True), 'another_column': SetValidator(valid_values=['1.50', '2'], unique=True)}
+            validation = Checkcel(source=str(source), format="tabular", engine="arrow", chunksize=chunksize, validators=validators)
+            val = validation.validate()
+            assert val is False
+            assert list(validation.failures['my_column'].keys()) == [2]
+            assert list(validation.failures['another_column'].keys()) == [3, 4]
+
+    def test_csv_arrow_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(readers, "pyarrow", None)
+        source = tmp_path / "data.csv"
+        source.write_text("my_column\nvalue\n\n")
+        validators = {'my_column': TextValidator()}
+        validation = Checkcel(source=str(source), format="tabular", engine="arrow", validators=validators)
+        assert validation.validate()
+        assert "Warning: pyarrow is not installed: using the pandas reader" in validation.logs
+
+    def test_invalid_rows_chunks(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column\nvalue1\nvalue2\nvalue3\n")
+        validators = {'my_column': TextValidator()}
+        validation = Checkcel(source=str(source), format="tabular", chunksize=2, expected_rows=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.logs[1] == "Error: Length issue: Expecting 2 row(s), found 3"
+
+    def test_invalid_rows_chunks_single_read(self, tmp_path, monkeypatch):
+        read_source = Checkcel._read_source
+        reads = []
+        monkeypatch.setattr(Checkcel, "_read_source", lambda self, columns=None: reads.append(1) or read_source(self, columns))
+        source = tmp_path / "data.csv"
+        source.write_text("my_column\nx\nvalue2\nvalue3\nvalue4\nvalue5\n")
+        validators = {'my_column': IntValidator()}
+        # Rows are still counted once the failure limit is reached
+        validation = Checkcel(source=str(source), format="tabular", chunksize=2, expected_rows=4, max_failures=1, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.logs[-1] == "Error: Length issue: Expecting 4 row(s), found 5"
+        assert len(reads) == 1
+
+    def test_valid_chunks(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column\nvalue1\nvalue2\nvalue3\n")
+        validators = {'my_column': TextValidator(unique=True)}
+        validation = Checkcel(source=str(source), format="tabular", chunksize=2, expected_rows=3, validators=validators)
+        assert validation.validate()
+
+    def test_invalid_xlsx_chunks(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["Some title"])
+        ws.append(["my_column", "another_column"])
+        for row in [["value1", 1], ["value2", "x"], [], ["value1", 4.0], ["value5", 5]]:
+            ws.append(row)
+        wb.save(source)
+        validators = {'my_column': TextValidator(unique=True), 'another_column': IntValidator()}
+        validation = Checkcel(source=source, row=1, chunksize=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [4, 5]
+        assert list(validation.failures['another_column'].keys()) == [3, 4]
+
+
+class TestCheckcelXlsxXml():
+
+    def _write_xlsx(self, source):
+        wb = Workbook()
+        wb.active.append(["Other sheet"])
+        ws = wb.create_sheet("Data")
+        ws.append(["Some title"])
+        ws.append(["my_column", "another_column", "date_column", None, "bool_column"])
+        ws.append(["value1", 1, datetime.datetime(2021, 3, 4), None, True])
+        ws.append([])
+        ws.append(["value1", 2.5, datetime.time(10, 30), None, False])
+        ws.cell(row=8, column=2, value=4.0)
+        ws.cell(row=8, column=7, value="far")
+        wb.save(source)
+
+    def test_read_xlsx_xml(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        self._write_xlsx(source)
+        for row in [0, 1]:
+            assert readers.read_xlsx_xml_header(source, sheet=1, row=row) == readers.read_xlsx_header(source, sheet=1, row=row)
+            for chunksize in [None, 2]:
+                expected = list(readers.read_xlsx(source, sheet=1, row=row, chunksize=chunksize or 10000))
+                batches = list(readers.read_xlsx_xml(source, sheet=1, row=row, chunksize=chunksize))
+                assert [list(df.columns) for df in batches] == [list(df.columns) for df in expected]
+                assert [df.values.tolist() for df in batches] == [df.values.tolist() for df in expected]
+        df = next(readers.read_xlsx_xml(source, sheet=1, row=1, usecols=['date_column']))
+        assert df['date_column'].tolist() == ['2021-03-04 00:00:00', '', '10:30:00', '', '', '']
+
+    def test_read_blank_header(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append([])
+        ws.append(["my_column", "another_column"])
+        ws.append(["value1", 1])
+        wb.save(source)
+        # As with pandas, the first row is the header, even if it is empty
+        expected = pd.read_excel(source, dtype=str, keep_default_na=False)
+        assert list(expected.columns) == ['Unnamed: 0', 'Unnamed: 1']
+        assert readers.read_xlsx_header(source) == readers.read_xlsx_xml_header(source) == []
+        for reader in [readers.read_xlsx, readers.read_xlsx_xml]:
+            df = next(reader(source))
+            assert list(df.columns) == []
+            assert len(df.index) == len(expected.index)
+
+    def test_invalid_xlsx_xml(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        self._write_xlsx(source)
+        validators = {'my_column': TextValidator(unique=True), 'another_column': IntValidator(), 'date_column': DateValidator(empty_ok=True), 'bool_column': SetValidator(valid_values=['True', 'False'], empty_ok=True)}
+        validation = Checkcel(source=source, sheet=1, row=1, engine="xml", validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [3, 4, 5, 6, 7]
+        assert list(validation.failures['another_column'].keys()) == [3, 4, 5, 6]
+        assert 'date_column' not in validation.failures
+
+
+class TestCheckcelNativeTypes():
+
+    def _write_xlsx(self, source):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["date_column", "time_column", "int_column", "float_column", "text_column"])
+        ws.append([datetime.datetime(2021, 3, 4), datetime.time(10, 30), 1, 1.5, 1])
+        ws.append(["05/03/2021", "11:00", 2.5, "2.5", "text"])
+        ws.append([datetime.datetime(2019, 1, 1), datetime.datetime(2021, 3, 4, 12, 0), 3.0, "x", True])
+        ws.append(["not a date", "not a time", "4", 200, ""])
+        wb.save(source)
+
+    def _validators(self):
+        return {
+            'date_column': DateValidator(after="01/01/2020"),
+            'time_column': TimeValidator(before="11:30"),
+            'int_column': IntValidator(unique=True),
+            'float_column': FloatValidator(max=100),
+            'text_column': SetValidator(valid_values=['1', 'text', 'True'])
+        }
+
+    def test_native_types(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        self._write_xlsx(source)
+        expected = Checkcel(source=source, validators=self._validators())
+        assert expected.validate() is False
+        expected_failures = {column: list(expected.failures[column].keys()) for column in expected.validators}
+        assert expected_failures == {'date_column': [3, 4], 'time_column': [3, 4], 'int_column': [2], 'float_column': [3, 4], 'text_column': [4]}
+        for engine, chunksize in [("pandas", None), ("pandas", 2), ("xml", None)]:
+            validation = Checkcel(source=source, engine=engine, chunksize=chunksize, native_types=True, validators=self._validators())
+            assert validation.validate() is False
+            assert {column: list(validation.failures[column].keys()) for column in validation.validators} == expected_failures
+
+    def test_native_types_not_parsed(self, tmp_path, monkeypatch):
+        source = str(tmp_path / "data.xlsx")
+        self._write_xlsx(source)
+        df = next(Checkcel(source=source, native_types=True, validators=self._validators())._read_source())
+        assert df['date_column'].tolist()[0] == datetime.datetime(2021, 3, 4)
+        assert df['int_column'].tolist()[:2] == [1, 2.5]
+        assert df['text_column'].tolist()[:2] == ['1', 'text']
+        parsed = []
+        parse = parser.parse
+
+        def counting_parse(field, *args, **kwargs):
+            parsed.append(field)
+            return parse(field, *args, **kwargs)
+
+        monkeypatch.setattr(parser, "parse", counting_parse)
+        validation = Checkcel(source=source, native_types=True, only_template_columns=True, validators={'date_column': DateValidator(), 'time_column': TimeValidator()})
+        assert validation.validate() is False
+        assert sorted(parsed) == ["05/03/2021", "not a date", "not a time"]
+
+
+class TestCheckcelOds():
+
+    def _write_ods(self, path, rows):
+        content = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+            'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+            '<office:body><office:spreadsheet>'
+            '<table:table table:name="Other"><table:table-row><table:table-cell office:value-type="string"><text:p>other</text:p></table:table-cell></table:table-row></table:table>'
+            '<table:table table:name="Data">{}</table:table>'
+            '</office:spreadsheet></office:body></office:document-content>'
+        ).format("".join(rows))
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+            archive.writestr("META-INF/manifest.xml", (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0">'
+                '<manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+                '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+                '</manifest:manifest>'
+            ))
+            archive.writestr("content.xml", content)
+
+    def _rows(self):
+        string = '<table:table-cell office:value-type="string"{}><text:p>{}</text:p></table:table-cell>'
+        number = '<table:table-cell office:value-type="float" office:value="{}"><text:p>{}</text:p></table:table-cell>'
+        empty = '<table:table-cell table:number-columns-repeated="{}"/>'
+        return [
+            '<table:table-row>{}</table:table-row>'.format(string.format("", "Some title")),
+            '<table:table-row>{}{}{}</table:table-row>'.format(string.format("", "my_column"), string.format("", "another_column"), empty.format(16000)),
+            '<table:table-row table:number-rows-repeated="2">{}{}{}</table:table-row>'.format(string.format("", "value1"), number.format("1.0", "1"), empty.format(16000)),
+            '<table:table-row table:number-rows-repeated="3"><table:table-cell table:number-columns-repeated="16384"/></table:table-row>',
+            '<table:table-row>{}{}</table:table-row>'.format(string.format("", 'two<text:s text:c="2"/>spaces'), number.format("2.5", "2.5")),
+            '<table:table-row>{}<table:covered-table-cell/>{}</table:table-row>'.format(empty.format(1), string.format(' table:number-columns-repeated="2"', "x")),
+            '<table:table-row table:number-rows-repeated="1048000"><table:table-cell table:number-columns-repeated="16384"/></table:table-row>',
+        ]
+
+    def test_read_ods(self, tmp_path):
+        pytest.importorskip("odf")
+        source = str(tmp_path / "data.ods")
+        self._write_ods(source, self._rows())
+        # Cells beyond the header are read as unnamed columns by pandas (and dropped by Checkcel)
+        expected = pd.read_excel(source, sheet_name=1, skiprows=1, dtype=str, keep_default_na=False)[['my_column', 'another_column']]
+        assert readers.read_ods_header(source, sheet=1, row=1) == ['my_column', 'another_column']
+        df = next(readers.read_ods(source, sheet=1, row=1))
+        assert list(df.columns) == list(expected.columns)
+        assert df.values.tolist() == expected.values.tolist()
+        assert df.values.tolist()[-2:] == [['two  spaces', '2.5'], ['', '']]
+
+    def test_invalid_ods_chunks(self, tmp_path):
+        source = str(tmp_path / "data.ods")
+        self._write_ods(source, self._rows())
+        for chunksize in [None, 2]:
+            validators = {'my_column': TextValidator(unique=True), 'another_column': FloatValidator()}
+            validation = Checkcel(source=source, sheet=1, row=1, chunksize=chunksize, validators=validators)
+            val = validation.validate()
+            assert val is False
+            assert list(validation.failures['my_column'].keys()) == [3, 4, 5, 6, 8]
+            assert list(validation.failures['another_column'].keys()) == [4, 5, 6, 8]
+
+
+class TestCheckcelPreflight():
+
+    def _fail_on_read(self):
+        raise AssertionError("The file should not be loaded")
+
+    def test_invalid_header_csv(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Checkcel, "_read_source", self._fail_on_read)
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,other_column\nvalue1,1\n")
+        validators = {'my_column': TextValidator(), 'another_column': IntValidator()}
+        validation = Checkcel(source=str(source), format="tabular", ignore_missing_validators=True, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.missing_fields == {'another_column'}
+
+    def test_invalid_header_xlsx(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Checkcel, "_read_source", self._fail_on_read)
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["my_column", None, "other_column"])
+        ws.append(["value1", "", 1])
+        wb.save(source)
+        validators = {'my_column': TextValidator()}
+        validation = Checkcel(source=source, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.missing_validators == {'other_column'}
+
+    def test_valid_header_xlsx(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["my_column", None, "other_column"])
+        ws.append(["value1", "", 1])
+        wb.save(source)
+        validators = {'my_column': TextValidator(), 'other_column': IntValidator()}
+        validation = Checkcel(source=source, validators=validators)
+        assert validation.validate()
+
+    def test_invalid_blank_first_row(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append([])
+        ws.append(["my_column", "other_column"])
+        ws.append(["value1", 1])
+        wb.save(source)
+        # The empty first row is the header, whatever the reader
+        for options in [{}, {'chunksize': 10}, {'engine': 'xml'}]:
+            validators = {'my_column': TextValidator(), 'other_column': IntValidator()}
+            validation = Checkcel(source=source, validators=validators, **options)
+            val = validation.validate()
+            assert val is False
+            assert validation.missing_fields == {'my_column', 'other_column'}
+
+
+class TestCheckcelProjection():
+
+    def test_projection_csv(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,other_column,free_column,linked_column,skipped_column\nvalue1,a,b,1,x\nvalue2,b,c,2,y\n")
+        validators = {
+            'my_column': SetValidator(valid_values=['value1']),
+            'free_column': NoValidator(),
+            'linked_column': IntValidator(empty_ok_if='free_column'),
+            'skipped_column': IntValidator(skip_validation=True)
+        }
+        validation = Checkcel(source=str(source), format="tabular", only_template_columns=True, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.usecols == ['my_column', 'free_column', 'linked_column']
+        assert list(validation.failures['my_column'].keys()) == [2]
+        assert 'linked_column' not in validation.failures
+
+    def test_projection_xlsx(self, tmp_path):
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["other_column", "my_column", "free_column", "another_column"])
+        for row in [["a", "value1", "", 1], ["b", "value2", "x", "y"], ["c", "value1", "", 3]]:
+            ws.append(row)
+        wb.save(source)
+        for chunksize in [None, 2]:
+            validators = {'my_column': TextValidator(unique=True), 'another_column': IntValidator(), 'free_column': NoValidator()}
+            validation = Checkcel(source=source, only_template_columns=True, chunksize=chunksize, validators=validators)
+            val = validation.validate()
+            assert val is False
+            assert validation.usecols == ['my_column', 'another_column']
+            assert list(validation.failures['my_column'].keys()) == [3]
+            assert list(validation.failures['another_column'].keys()) == [2]
+
+    def test_projection_blank_first_row(self, tmp_path, monkeypatch):
+        source = str(tmp_path / "data.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append([])
+        ws.append(["my_column", "other_column"])
+        ws.append(["value1", 1])
+        wb.save(source)
+        for options in [{}, {'chunksize': 10}, {'engine': 'xml'}]:
+            validators = {'my_column': TextValidator(), 'other_column': IntValidator()}
+            validation = Checkcel(source=source, only_template_columns=True, validators=validators, **options)
+            assert validation.validate() is False
+            assert validation.missing_fields == {'my_column', 'other_column'}
+
+        # Columns of the header missing from the loaded file are reported, instead of making pandas raise
+        monkeypatch.setattr(Checkcel, "_read_header", lambda self: ["my_column", "other_column"])
+        for options in [{}, {'chunksize': 10}]:
+            validators = {'my_column': TextValidator(), 'other_column': IntValidator()}
+            validation = Checkcel(source=source, only_template_columns=True, validators=validators, **options)
+            assert validation.validate() is False
+            assert validation.missing_fields == {'my_column', 'other_column'}
+
+    def test_projection_missing_fields(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,other_column\nvalue1,a\n")
+        validators = {'my_column': TextValidator(), 'free_column': NoValidator()}
+        validation = Checkcel(source=str(source), format="tabular", only_template_columns=True, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.missing_fields == {'free_column'}
+
+
+class TestCheckcelCategorical():
+
+    def _validators(self):
+        return {
+            'my_column': SetValidator(valid_values=['value1', 'value2'], unique=True),
+            'linked_column': LinkedSetValidator(linked_column='my_column', valid_values={'value1': ['1', '2'], 'value2': ['2']}),
+            'id_column': TextValidator(unique=True)
+        }
+
+    def test_categorical(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,linked_column,id_column\nvalue1,1,a\nvalue2,3,b\nvalue1,2,c\nvalue3,1,d\n,1,a\n")
+        results = []
+        for categorical, chunksize in [(True, None), (False, None), (True, 2)]:
+            validation = Checkcel(source=str(source), format="tabular", categorical=categorical, chunksize=chunksize, validators=self._validators())
+            assert validation.validate() is False
+            results.append({column: (list(validation.failures[column].keys()), validation.validators[column].bad) for column in validation.validators})
+        assert results[0] == results[1] == results[2]
+        assert results[0]['my_column'][0] == [3, 4, 5]
+        assert results[0]['linked_column'][0] == [2, 4, 5]
+        assert results[0]['id_column'][0] == [5]
+
+    def test_categorical_read(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,linked_column,id_column\nvalue1,1,a\nvalue2,1,b\n")
+        for chunksize in [None, 1]:
+            validation = Checkcel(source=str(source), format="tabular", categorical=True, chunksize=chunksize, validators=self._validators())
+            df = next(validation._read_source(validation._read_header()))
+            assert isinstance(df['my_column'].dtype, pd.CategoricalDtype)
+            assert isinstance(df['linked_column'].dtype, pd.CategoricalDtype)
+            assert df['id_column'].dtype == object
+
+
+class TestCheckcelJobs():
+
+    def test_invalid_jobs(self):
+        data = {
+            'my_column': ['value1', 'value2', 'value1', ''],
+            'linked_column': ['1', '3', '2', '1'],
+            'another_column': ['1', 'x', '', '4'],
+            'empty_column': ['', '', 'a', '']
+        }
+        validators = {
+            'my_column': SetValidator(valid_values=['value1', 'value2']),
+            'linked_column': LinkedSetValidator(linked_column='my_column', valid_values={'value1': ['1', '2'], 'value2': ['2']}),
+            'another_column': IntValidator(unique=True, empty_ok_if='empty_column'),
+            'empty_column': TextValidator(empty_ok=True)
+        }
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, jobs=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [4]
+        assert list(validation.failures['linked_column'].keys()) == [2, 4]
+        assert list(validation.failures['another_column'].keys()) == [2]
+        assert validation.validators['linked_column'].fail_count == 2
+        assert validation.validators['linked_column'].bad['invalid_rows'] == {2, 4}
+
+    def test_invalid_jobs_rows(self):
+        data = {
+            'my_column': ['value1', 'value2', 'value1', 'value3', 'value2', 'value4', ''],
+            'another_column': ['a', 'b', 'a', 'b', 'b', 'c', 'c']
+        }
+        validators = {
+            'my_column': TextValidator(unique=True),
+            'another_column': UniqueValidator(unique_with=['my_column'])
+        }
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, jobs=3, parallel="rows", validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert list(validation.failures['my_column'].keys()) == [3, 5, 7]
+        assert list(validation.failures['another_column'].keys()) == [3, 5]
+        assert validation.validators['my_column'].bad['invalid_unique'] == {'value1': {3}, 'value2': {5}}
+        assert validation.validators['another_column'].fail_count == 2
+
+    def test_invalid_jobs_chunks(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column\nvalue1,1\nvalue2,x\nvalue1,3\nvalue3,1\nvalue2,5\n")
+        for parallel in ["columns", "rows"]:
+            validators = {'my_column': TextValidator(unique=True), 'another_column': IntValidator(unique=True)}
+            # Values seen in the previous chunks stay in this process: duplicates across chunks are found when merging
+            validation = Checkcel(source=str(source), format="tabular", chunksize=2, jobs=2, parallel=parallel, validators=validators)
+            val = validation.validate()
+            assert val is False
+            assert list(validation.failures['my_column'].keys()) == [3, 5]
+            assert list(validation.failures['another_column'].keys()) == [2, 4]
+            assert validation.validators['my_column'].bad['invalid_unique'] == {'value1': {3}, 'value2': {5}}
+            assert len(validation.validators['another_column'].unique_values) == 3
+
+
+class TestCheckcelMaxFailures():
+
+    def test_max_failures(self, monkeypatch):
+        checked = []
+        check = DateValidator._check
+
+        def counting_check(self, field, row):
+            checked.append(field)
+            return check(self, field, row)
+
+        monkeypatch.setattr(DateValidator, "_check", counting_check)
+        data = {
+            'my_column': ['01/01/2000', 'x', 'y', '02/01/2000', 'z', 'w'],
+            'another_column': ['x', '01/01/2000', '02/01/2000', '01/01/2000', '02/01/2000', '01/01/2000']
+        }
+        validators = {
+            'my_column': DateValidator(),
+            'another_column': DateValidator()
+        }
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, max_failures=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.truncated
+        assert list(validation.failures['my_column'].keys()) == [2, 3]
+        assert 'another_column' not in validation.failures
+        # Validation stopped at the second failure
+        assert checked == ['01/01/2000', 'x', 'y']
+
+    def test_max_failures_per_column(self):
+        data = {
+            'my_column': ['a', 'x', 'y', 'a', 'z', 'a'],
+            'another_column': ['1', '1', '2', '2', '3', '4']
+        }
+        validators = {
+            'my_column': SetValidator(valid_values=['a', 'b']),
+            'another_column': IntValidator(unique=True)
+        }
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, max_failures_per_column=1, chunksize=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.truncated
+        assert list(validation.failures['my_column'].keys()) == [2]
+        assert list(validation.failures['another_column'].keys()) == [2]
+        assert validation.validators['my_column'].fail_count == 1
+
+    def test_max_failures_per_column_unvalidated(self, tmp_path, monkeypatch):
+        validated = []
+        validate = Checkcel._validate
+
+        def counting_validate(self, df, executor=None):
+            validated.append(list(df.index))
+            return validate(self, df, executor)
+
+        monkeypatch.setattr(Checkcel, "_validate", counting_validate)
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column,free_column\nx,1,a\na,1,b\ny,2,c\na,2,d\nz,3,e\n")
+        validators = {
+            'my_column': SetValidator(valid_values=['a', 'b']),
+            'another_column': IntValidator(unique=True),
+            'free_column': NoValidator()
+        }
+        validation = Checkcel(source=str(source), format="tabular", max_failures_per_column=1, chunksize=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert validation.truncated
+        assert list(validation.failures['my_column'].keys()) == [1]
+        assert list(validation.failures['another_column'].keys()) == [2]
+        # The free column does not keep the validation going: the last chunks are not validated
+        assert len(validated) == 1
+
+    def test_max_failures_not_reached(self):
+        data = {'my_column': ['a', 'x', 'a']}
+        validators = {'my_column': SetValidator(valid_values=['a', 'b'])}
+        df = pd.DataFrame.from_dict(data)
+        validation = Checkcel(data=df, max_failures=2, validators=validators)
+        val = validation.validate()
+        assert val is False
+        assert not validation.truncated
+        assert list(validation.failures['my_column'].keys()) == [2]
+
+    def test_max_failures_jobs(self, tmp_path):
+        source = tmp_path / "data.csv"
+        rows = ["{},{},{}".format("id{}".format(index % 7), "rqs"[index % 3] if index % 2 else index, index % 4) for index in range(24)]
+        source.write_text("my_column,another_column,third_column\n" + "\n".join(rows) + "\n")
+
+        def report(**options):
+            validators = {'my_column': TextValidator(unique=True), 'another_column': IntValidator(), 'third_column': UniqueValidator(unique_with=['my_column'])}
+            validation = Checkcel(source=str(source), format="tabular", max_failures=5, validators=validators, **options)
+            assert validation.validate() is False
+            bad = {column: (validator.fail_count, validator.bad['invalid_set'], validator.bad['invalid_rows'], dict(validator.bad['invalid_unique'])) for column, validator in validation.validators.items()}
+            return validation.logs, bad, validation.truncated
+
+        # Failures found by the workers beyond the limit are not reported, nor kept by the validators
+        for chunksize in [None, 10]:
+            expected = report(chunksize=chunksize)
+            assert report(chunksize=chunksize, jobs=2) == expected
+            assert report(chunksize=chunksize, jobs=2, parallel="rows") == expected
+
+    def test_max_failures_exactly_reached(self, tmp_path):
+        source = tmp_path / "data.csv"
+        source.write_text("my_column,another_column\na,1\nx,2\na,3\ny,1\n")
+        # The whole file is checked: nothing is missing from the report
+        for options in [{}, {'chunksize': 2}, {'jobs': 2}, {'jobs': 2, 'parallel': 'rows'}]:
+            validators = {'my_column': SetValidator(valid_values=['a']), 'another_column': IntValidator(unique=True)}
+            validation = Checkcel(source=str(source), format="tabular", max_failures=3, validators=validators, **options)
+            val = validation.validate()
+            assert val is False
+            assert not validation.truncated
+            assert list(validation.failures['my_column'].keys()) == [2, 4]
+            assert list(validation.failures['another_column'].keys()) == [4]
+
+        # The last row of another_column is left unchecked
+        validators = {'my_column': SetValidator(valid_values=['a']), 'another_column': IntValidator(unique=True)}
+        validation = Checkcel(source=str(source), format="tabular", max_failures=2, validators=validators)
+        assert validation.validate() is False
+        assert validation.truncated